@@ -1,8 +1,11 @@
 import os
+import cv2
 import subprocess
 import numpy as np
 from scipy.io import wavfile
 from scipy.signal import correlate
+from audio.marker_matcher import MultiMarkerMatcher
+from ingestion.mjpeg_store import MjpegStore
 
 class AudioMarker:
     def __init__(self, min_duration_sec=10600):
@@ -10,6 +13,7 @@ class AudioMarker:
         min_duration_sec: minimum analysis duration in seconds (default 2.9 hours)
         """
         self.min_duration_sec = min_duration_sec
+        self.audio_path = None
 
     # -------------------------------
     # Extract audio from video
@@ -28,6 +32,7 @@ class AudioMarker:
             audio_path
         ]
         subprocess.run(cmd, check=True)
+        self.audio_path = audio_path
         return audio_path
 
     # -------------------------------
@@ -52,17 +57,36 @@ class AudioMarker:
         timestamp_sec = peaks[0] / sr_vid
         return timestamp_sec
 
+    # -------------------------------
+    # Detect several references in one pass
+    # -------------------------------
+    def detect_markers(self, video_audio_path, reference_paths, threshold=0.85):
+        """
+        reference_paths: {name: wav_path}, e.g. start / end / mid-session bell
+
+        Returns {name: timestamp_sec or None}. The video WAV is read once and
+        its block FFTs are shared by every reference.
+        """
+        matcher = MultiMarkerMatcher.from_files(reference_paths, threshold=threshold)
+        return matcher.match_file(video_audio_path)
+
     # -------------------------------
     # Get start/end timestamps
     # -------------------------------
     def get_analysis_window(self, video_path, start_ref, end_ref):
         """
         Returns start_sec, end_sec for analysis
+
+        Audio only: ffmpeg is run with -vn, so no video frame is decoded.
         """
         video_audio = self.extract_audio(video_path)
 
-        start_sec = self.detect_audio_timestamp(video_audio, start_ref)
-        end_sec = self.detect_audio_timestamp(video_audio, end_ref)
+        markers = self.detect_markers(
+            video_audio,
+            {"start": start_ref, "end": end_ref}
+        )
+        start_sec = markers["start"]
+        end_sec = markers["end"]
 
         if start_sec is None:
             raise ValueError("Start audio not detected.")
@@ -73,15 +97,116 @@ class AudioMarker:
 
         return start_sec, end_sec
 
+    # -------------------------------
+    # Per-second activity timeline (RMS + spectral flux)
+    # -------------------------------
+    def analyze_activity(
+        self,
+        start_sec,
+        end_sec,
+        video_audio_path=None,
+        n_fft=512,
+        spike_z=4.0
+    ):
+        """
+        One streaming pass over the analysis window of the extracted WAV.
+
+        Returns:
+        {
+            "rms":    [per-second RMS],
+            "flux":   [per-second mean spectral flux],
+            "spikes": [seconds since ANALYSIS WINDOW START]
+        }
+
+        Spikes (rustling, coughing, standing up) are seconds whose RMS or
+        flux is more than spike_z robust deviations above the session median.
+        """
+        if video_audio_path is None:
+            video_audio_path = self.audio_path
+
+        sr, audio = wavfile.read(video_audio_path, mmap=True)
+
+        first = max(int(start_sec * sr), 0)
+        last = min(int(end_sec * sr), len(audio))
+        frames_per_sec = sr // n_fft
+        window = np.hanning(n_fft)
+
+        rms = []
+        flux = []
+        prev_mag = None
+
+        for offset in range(first, last - sr + 1, sr):
+            second = np.asarray(audio[offset:offset + sr], dtype=np.float32) / 32768.0
+
+            rms.append(float(np.sqrt(np.mean(second ** 2))))
+
+            frames = second[:frames_per_sec * n_fft].reshape(frames_per_sec, n_fft)
+            mag = np.abs(np.fft.rfft(frames * window, axis=1))
+
+            if prev_mag is not None:
+                mag_seq = np.vstack([prev_mag[None, :], mag])
+            else:
+                mag_seq = mag
+
+            rise = np.maximum(np.diff(mag_seq, axis=0), 0).sum(axis=1)
+            flux.append(float(rise.mean()) if len(rise) else 0.0)
+            prev_mag = mag[-1]
+
+        spikes = sorted(
+            set(self._robust_spikes(rms, spike_z)) |
+            set(self._robust_spikes(flux, spike_z))
+        )
+
+        return {
+            "rms": rms,
+            "flux": flux,
+            "spikes": spikes
+        }
+
+    @staticmethod
+    def _robust_spikes(values, z):
+        if len(values) == 0:
+            return []
+
+        values = np.asarray(values)
+        median = np.median(values)
+        mad = np.median(np.abs(values - median)) * 1.4826 + 1e-9
+
+        return [int(i) for i in np.where((values - median) / mad > z)[0]]
+
     # -------------------------------
     # Slice frames based on timestamps
     # -------------------------------
     def slice_frames(self, frames_dir, start_sec, end_sec, fps=1):
-        start_frame = int(start_sec * fps)
-        end_frame = int(end_sec * fps)
+        """
+        range of frame indices inside [start_sec, end_sec), for the MJPEG
+        frame store and legacy .jpg dumps alike (read them with read_frame)
+        """
+        if MjpegStore.exists(frames_dir):
+            store = MjpegStore(frames_dir)
+            try:
+                return store.index_range(start_sec, end_sec)
+            finally:
+                store.close()
 
-        frame_files = sorted([f for f in os.listdir(frames_dir) if f.endswith(".jpg")])
-        return frame_files[start_frame:end_frame]
+        frame_count = len([f for f in os.listdir(frames_dir) if f.endswith(".jpg")])
+        start_frame = min(int(start_sec * fps), frame_count)
+        end_frame = min(int(end_sec * fps), frame_count)
+
+        return range(start_frame, max(end_frame, start_frame))
+
+    def read_frame(self, frames_dir, i):
+        """
+        BGR frame i of frames_dir (an index from slice_frames)
+        """
+        if MjpegStore.exists(frames_dir):
+            store = MjpegStore(frames_dir)
+            try:
+                return store.read(i)
+            finally:
+                store.close()
+
+        return cv2.imread(os.path.join(frames_dir, f"{i:05d}.jpg"))
 
 #+++++++++++++++++++++++++version 2+++++++++++++++++++
 # import os
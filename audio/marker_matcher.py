@@ -0,0 +1,118 @@
+import numpy as np
+from scipy.io import wavfile
+
+
+class MultiMarkerMatcher:
+    """
+    Finds K reference clips in one long signal with a single overlap-save pass.
+
+    Every signal block is FFT'd once and multiplied by the conjugate spectrum
+    of each template, so K correlation tracks cost about one FFT pass plus
+    K cheap inverse FFTs per block.
+    """
+
+    def __init__(self, references, threshold=0.85, min_nfft=1 << 16):
+        """
+        references : dict -> {name: 1D array}
+        threshold  : fraction of the track's global peak a lag must exceed
+        """
+        self.threshold = threshold
+        self.names = list(references.keys())
+        self.templates = {
+            name: np.asarray(ref, dtype=np.float64)
+            for name, ref in references.items()
+        }
+
+        self.max_len = max(len(t) for t in self.templates.values())
+        self.nfft = 1 << int(np.ceil(np.log2(max(4 * self.max_len, min_nfft))))
+        self.step = self.nfft - self.max_len + 1
+
+        self.spectra = {
+            name: np.conj(np.fft.rfft(t, self.nfft))
+            for name, t in self.templates.items()
+        }
+
+    # -------------------------------
+    # Load templates from WAV files
+    # -------------------------------
+    @classmethod
+    def from_files(cls, reference_paths, threshold=0.85):
+        references = {}
+        for name, path in reference_paths.items():
+            _, ref_audio = wavfile.read(path)
+            references[name] = ref_audio
+        return cls(references, threshold=threshold)
+
+    # -------------------------------
+    # Correlation of one block
+    # -------------------------------
+    def _block_spectrum(self, signal, start):
+        block = np.zeros(self.nfft, dtype=np.float64)
+        chunk = signal[start:start + self.nfft]
+        block[:len(chunk)] = chunk
+        return np.fft.rfft(block)
+
+    def _block_track(self, spectrum, name, start, n_valid):
+        limit = min(self.step, n_valid - start)
+        track = np.fft.irfft(spectrum * self.spectra[name], self.nfft)
+        return track[:limit]
+
+    # -------------------------------
+    # Match all templates
+    # -------------------------------
+    def match(self, signal, sr):
+        """
+        Returns {name: first timestamp_sec above threshold, or None}
+
+        Same decision as correlate(signal, ref, mode="valid") normalised by
+        its max, but only per-block maxima are kept in memory; the winning
+        block is recomputed to find the exact lag.
+        """
+        n_valid = {
+            name: len(signal) - len(t) + 1
+            for name, t in self.templates.items()
+        }
+        span = max(n_valid.values())
+
+        block_peaks = {name: [] for name in self.names}
+
+        for start in range(0, max(span, 0), self.step):
+            spectrum = self._block_spectrum(signal, start)
+
+            for name in self.names:
+                if start >= n_valid[name]:
+                    continue
+                track = self._block_track(spectrum, name, start, n_valid[name])
+                block_peaks[name].append((start, track.max()))
+
+        results = {}
+        for name in self.names:
+            peaks = block_peaks[name]
+            if not peaks:
+                results[name] = None
+                continue
+
+            global_max = max(p for _, p in peaks)
+            if global_max <= 0:
+                results[name] = None
+                continue
+
+            cutoff = self.threshold * global_max
+            results[name] = None
+
+            for start, peak in peaks:
+                if peak > cutoff:
+                    spectrum = self._block_spectrum(signal, start)
+                    track = self._block_track(spectrum, name, start, n_valid[name])
+                    lag = start + int(np.argmax(track > cutoff))
+                    results[name] = lag / sr
+                    break
+
+        return results
+
+    def match_file(self, audio_path):
+        """
+        Reads the WAV once (memory-mapped) and matches every template
+        """
+        sr, signal = wavfile.read(audio_path, mmap=True)
+        return self.match(signal, sr)
@@ -0,0 +1,333 @@
+"""
+Central video decoder factory.
+
+Every pipeline stage opens videos through open_decoder() instead of
+cv2.VideoCapture, so the backend and decode threading are configured in
+one place:
+
+- "opencv": cv2.VideoCapture on the FFmpeg backend with an explicit
+  decode thread count (where the OpenCV build supports it)
+- "pyav"  : PyAV with frame/slice threading (thread_type="AUTO"),
+  optional keyframe-only decoding (skip_frame="NONKEY") and reduced
+  output resolution
+
+Both expose the cv2.VideoCapture subset the pipeline uses (read, grab,
+retrieve, get, set, isOpened, release), decode-FPS statistics and
+pts_sec(): the presentation time of the last grabbed frame, which stays
+correct on variable-frame-rate recordings where frame_idx / fps drifts.
+
+Environment: DECODER_BACKEND = auto (default: pyav when installed) | opencv | pyav,
+DECODE_THREADS (0 = auto)
+"""
+
+import os
+import time
+import cv2
+
+
+def _default_threads():
+    return int(os.getenv("DECODE_THREADS", 0))
+
+
+class _DecodeStats:
+    def _init_stats(self):
+        self.frames_decoded = 0
+        self.decode_seconds = 0.0
+        self._last_pts = None
+        self._pts_cache = None      # pts of the current frame, once computed
+
+    def _monotonic_pts(self, pts, fps):
+        """
+        Containers without usable timestamps report 0 / repeats; then step
+        forward by one nominal frame instead
+        """
+        if self._pts_cache is not None:
+            return self._pts_cache
+
+        if self._last_pts is not None and pts <= self._last_pts:
+            pts = self._last_pts + (1.0 / fps if fps else 0.0)
+        self._last_pts = pts
+        self._pts_cache = pts
+        return pts
+
+    def _reset_pts(self):
+        self._last_pts = None
+        self._pts_cache = None
+
+    def _count(self, started, ok):
+        self._pts_cache = None
+        self.decode_seconds += time.perf_counter() - started
+        if ok:
+            self.frames_decoded += 1
+
+    def decode_fps(self):
+        if self.decode_seconds <= 0:
+            return 0.0
+        return self.frames_decoded / self.decode_seconds
+
+    def report(self, label="decode"):
+        print(f"{label}: {self.frames_decoded} frames at {self.decode_fps():.1f} fps "
+              f"({self.backend}, threads={self.threads or 'auto'})")
+
+
+class OpenCVDecoder(_DecodeStats):
+    backend = "opencv"
+
+    def __init__(self, path, threads=0, scale=None):
+        self.threads = threads
+        self.scale = scale
+        self._init_stats()
+
+        # CAP_PROP_N_THREADS exists in OpenCV >= 4.6 only
+        n_threads = getattr(cv2, "CAP_PROP_N_THREADS", None)
+        if threads and n_threads is not None:
+            self.cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG, [n_threads, threads])
+        else:
+            self.cap = cv2.VideoCapture(path)
+
+    def _resize(self, frame):
+        if self.scale and frame is not None:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale,
+                               interpolation=cv2.INTER_AREA)
+        return frame
+
+    def grab(self):
+        started = time.perf_counter()
+        ok = self.cap.grab()
+        self._count(started, ok)
+        return ok
+
+    def retrieve(self):
+        ret, frame = self.cap.retrieve()
+        return ret, self._resize(frame) if ret else frame
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def pts_sec(self):
+        """
+        Presentation time (seconds) of the last grabbed frame
+        """
+        return self._monotonic_pts(
+            self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0,
+            self.cap.get(cv2.CAP_PROP_FPS)
+        )
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        self._reset_pts()
+        return self.cap.set(prop, value)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class PyAVDecoder(_DecodeStats):
+    backend = "pyav"
+
+    def __init__(self, path, threads=0, keyframes_only=False, scale=None):
+        import av
+
+        self.threads = threads
+        self.scale = scale
+        self.keyframes_only = keyframes_only
+        self._init_stats()
+
+        self._pending = None
+        self._last_time = 0.0       # pts of the last grabbed frame / seek target
+        self._start_sec = 0.0       # stream start_time; times are relative to it
+        self._grabbed = False
+        self._frames = None
+
+        try:
+            self.container = av.open(path)
+            self.stream = self.container.streams.video[0]
+        except (av.error.FFmpegError, OSError, IndexError):
+            self.container = None
+            self.stream = None
+            return
+
+        # Like OpenCV's POS_MSEC (and the audio-marker clock): 0 = first frame
+        if self.stream.start_time:
+            self._start_sec = float(self.stream.start_time * self.stream.time_base)
+
+        self.stream.thread_type = "AUTO"
+        if threads:
+            self.stream.thread_count = threads
+        if keyframes_only:
+            self.stream.codec_context.skip_frame = "NONKEY"
+
+        self._frames = self.container.decode(self.stream)
+
+    # -------------------------------
+    # Properties
+    # -------------------------------
+    @property
+    def fps(self):
+        rate = self.stream.average_rate or self.stream.guessed_rate
+        return float(rate) if rate else 0.0
+
+    def _frame_time(self, frame):
+        if frame.time is not None:
+            return float(frame.time) - self._start_sec
+        return self._last_time + (1.0 / self.fps if self.fps else 0.0)
+
+    def pts_sec(self):
+        """
+        Presentation time (seconds) of the last grabbed frame
+        """
+        return self._monotonic_pts(self._last_time, self.fps)
+
+    def get(self, prop):
+        if self.stream is None:
+            return 0.0
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            if self.stream.frames:
+                return float(self.stream.frames)
+            duration = float(self.container.duration or 0) / 1e6
+            return duration * self.fps
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.stream.codec_context.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.stream.codec_context.height)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return self._last_time * 1000.0
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            # Like OpenCV: index of the NEXT frame
+            return float(round(self._last_time * self.fps) + int(self._grabbed))
+        return 0.0
+
+    # -------------------------------
+    # Decoding
+    # -------------------------------
+    def grab(self):
+        if self._frames is None:
+            return False
+
+        started = time.perf_counter()
+        try:
+            self._pending = next(self._frames)
+        except StopIteration:
+            self._pending = None
+        self._count(started, self._pending is not None)
+
+        if self._pending is None:
+            return False
+        self._last_time = self._frame_time(self._pending)
+        self._grabbed = True
+        return True
+
+    def retrieve(self):
+        if self._pending is None:
+            return False, None
+
+        if self.scale:
+            width = int(self._pending.width * self.scale) // 2 * 2
+            height = int(self._pending.height * self.scale) // 2 * 2
+            return True, self._pending.to_ndarray(format="bgr24", width=width, height=height)
+        return True, self._pending.to_ndarray(format="bgr24")
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def set(self, prop, value):
+        if self.stream is None:
+            return False
+
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            target = value / 1000.0
+        elif prop == cv2.CAP_PROP_POS_FRAMES:
+            target = value / self.fps if self.fps else 0.0
+        else:
+            return False
+
+        self._reset_pts()
+
+        # Seek to the keyframe before target, then decode forward to it
+        offset = int(target / self.stream.time_base) + (self.stream.start_time or 0)
+        self.container.seek(offset, stream=self.stream, backward=True, any_frame=False)
+        self._frames = self.container.decode(self.stream)
+        self._pending = None
+
+        if not self.keyframes_only:
+            half_frame = 0.5 / self.fps if self.fps else 0.0
+            while True:
+                try:
+                    frame = next(self._frames)
+                except StopIteration:
+                    self._frames = iter(())
+                    break
+                if self._frame_time(frame) >= target - half_frame:
+                    # Next grab() returns this frame
+                    self._frames = _prepend(frame, self._frames)
+                    break
+
+        self._last_time = target
+        self._grabbed = False
+        return True
+
+    def isOpened(self):
+        return self.stream is not None
+
+    def release(self):
+        if self.container is not None:
+            self.container.close()
+            self.container = None
+            self.stream = None
+            self._frames = None
+
+
+def _prepend(item, iterator):
+    yield item
+    yield from iterator
+
+
+_fallback_warned = set()
+
+
+def warn_keyframe_fallback(caller):
+    """
+    Logs once per process that caller decodes full GOPs (no PyAV)
+    """
+    if caller not in _fallback_warned:
+        _fallback_warned.add(caller)
+        print(f"⚠️ {caller}: PyAV (av) not installed, keyframes are read with "
+              f"an OpenCV seek + decode per sample (slow)")
+
+
+def pyav_available():
+    try:
+        import av  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def open_decoder(path, backend=None, threads=None, keyframes_only=False, scale=None):
+    """
+    backend        : "opencv" | "pyav" | "auto" (default: $DECODER_BACKEND or auto)
+    threads        : decode threads, 0 = library default ($DECODE_THREADS)
+    keyframes_only : decode only keyframes (PyAV; OpenCV decodes everything)
+    scale          : output resolution factor, e.g. 0.5 for probing
+    """
+    backend = (backend or os.getenv("DECODER_BACKEND", "auto")).lower()
+    threads = _default_threads() if threads is None else threads
+
+    if backend == "auto":
+        backend = "pyav" if pyav_available() else "opencv"
+
+    if backend == "pyav":
+        return PyAVDecoder(path, threads=threads, keyframes_only=keyframes_only, scale=scale)
+
+    return OpenCVDecoder(path, threads=threads, scale=scale)
@@ -0,0 +1,183 @@
+import os
+import json
+import bisect
+import cv2
+import numpy as np
+from ingestion.video_probe import probe_video
+from ingestion.decoder import open_decoder
+
+
+class FrameStore:
+    """
+    Sampled, downscaled frames of one video in a single memory-mapped
+    uint8 file (frames.u8, shape N x H x W x 3, BGR) plus index.json with
+    the source timestamp of every frame.
+
+    Indexing returns read-only views into the map (no copy, no decode);
+    copy a frame before drawing on it.
+    """
+
+    FRAMES = "frames.u8"
+    INDEX = "index.json"
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+
+        with open(os.path.join(store_dir, self.INDEX)) as f:
+            self.index = json.load(f)
+
+        self.timestamps = self.index["timestamps"]
+        shape = (len(self.timestamps), self.index["height"], self.index["width"], 3)
+
+        self.frames = np.memmap(
+            os.path.join(store_dir, self.FRAMES),
+            dtype=np.uint8,
+            mode="r",
+            shape=shape
+        ) if shape[0] else np.zeros(shape, dtype=np.uint8)
+
+    # -------------------------------
+    # Random access
+    # -------------------------------
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, i):
+        return self.frames[i]
+
+    @property
+    def scale(self):
+        """
+        source width / stored width (multiply stored coordinates by it)
+        """
+        return self.index["source_width"] / self.index["width"]
+
+    def index_at(self, sec):
+        """
+        Index of the last frame at or before sec
+        """
+        return max(bisect.bisect_right(self.timestamps, sec) - 1, 0)
+
+    def frame_at(self, sec):
+        i = self.index_at(sec)
+        return self.timestamps[i], self.frames[i]
+
+    def slice_time(self, start_sec, end_sec):
+        """
+        (timestamps, frames view) for start_sec <= t < end_sec
+        """
+        lo = bisect.bisect_left(self.timestamps, start_sec)
+        hi = bisect.bisect_left(self.timestamps, end_sec)
+        return self.timestamps[lo:hi], self.frames[lo:hi]
+
+    def iter_frames(self, start_sec=None, end_sec=None):
+        """
+        Yields (timestamp_sec, frame view)
+        """
+        lo = 0 if start_sec is None else bisect.bisect_left(self.timestamps, start_sec)
+        hi = len(self) if end_sec is None else bisect.bisect_left(self.timestamps, end_sec)
+        for i in range(lo, hi):
+            yield self.timestamps[i], self.frames[i]
+
+
+def _source_key(video_path):
+    stat = os.stat(video_path)
+    return {"path": os.path.abspath(video_path), "mtime": stat.st_mtime, "size": stat.st_size}
+
+
+def build_frame_store(video_path, store_dir, fps=1.0, width=640, start_sec=0.0, end_sec=None):
+    """
+    Decodes video_path once and writes a FrameStore.
+
+    fps   : sampling rate of the stored frames
+    width : stored width (aspect kept); None = source resolution
+    """
+    meta = probe_video(video_path)
+    video_fps = meta["fps"] or 30.0
+    end_sec = meta["duration"] if end_sec is None else min(end_sec, meta["duration"] or end_sec)
+
+    src_w, src_h = meta["width"], meta["height"]
+    width = width or src_w
+    height = int(round(src_h * width / src_w))
+
+    stride = max(int(round(video_fps / fps)), 1)
+    first = int(start_sec * video_fps)
+    last = int(end_sec * video_fps)
+    capacity = (last - first) // stride + 1
+
+    os.makedirs(store_dir, exist_ok=True)
+    frames_path = os.path.join(store_dir, FrameStore.FRAMES)
+    frames = np.memmap(frames_path, dtype=np.uint8, mode="w+",
+                       shape=(capacity, height, width, 3))
+
+    cap = open_decoder(video_path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+
+    timestamps = []
+    frame_idx = first
+    while frame_idx <= last and len(timestamps) < capacity:
+        if not cap.grab():
+            break
+
+        if (frame_idx - first) % stride == 0:
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            if frame.shape[1] != width:
+                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            frames[len(timestamps)] = frame
+            timestamps.append(cap.pts_sec())
+
+        frame_idx += 1
+
+    cap.release()
+    frames.flush()
+    del frames
+
+    # Stream shorter than the probe said → drop the unused tail
+    os.truncate(frames_path, len(timestamps) * height * width * 3)
+
+    index = {
+        "source": _source_key(video_path),
+        "fps": fps,
+        "start_sec": start_sec,
+        "end_sec": end_sec,
+        "width": width,
+        "height": height,
+        "source_width": src_w,
+        "timestamps": timestamps
+    }
+    tmp = os.path.join(store_dir, FrameStore.INDEX + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp, os.path.join(store_dir, FrameStore.INDEX))
+
+    return FrameStore(store_dir)
+
+
+def open_frame_store(video_path, fps=1.0, width=640, start_sec=0.0, end_sec=None, store_dir=None):
+    """
+    Existing store for these parameters, built on first use.
+    Default location: <video>.frames_<fps>fps_<width>/
+    """
+    store_dir = store_dir or f"{video_path}.frames_{fps:g}fps_{width or 'src'}"
+    duration = probe_video(video_path)["duration"]
+    end_sec = duration if end_sec is None else min(end_sec, duration or end_sec)
+
+    try:
+        store = FrameStore(store_dir)
+        idx = store.index
+        if (
+            idx["source"] == _source_key(video_path)
+            and idx["fps"] == fps
+            and idx["width"] == (width or idx["source_width"])
+            and idx["start_sec"] <= start_sec
+            and idx["end_sec"] >= end_sec
+        ):
+            return store
+    except (OSError, ValueError, KeyError):
+        pass
+
+    print(f"Building frame store in {store_dir} (one-time decode)...")
+    return build_frame_store(video_path, store_dir, fps=fps, width=width,
+                             start_sec=start_sec, end_sec=end_sec)
@@ -0,0 +1,113 @@
+import os
+import mmap
+import json
+import cv2
+import numpy as np
+
+
+class MjpegWriter:
+    """
+    Appends JPEG-encoded frames to one file (frames.mjpeg) and records an
+    offset index (frames.index.npy: offset, length, timestamp per frame),
+    instead of one .jpg file per frame.
+    """
+
+    def __init__(self, store_dir, quality=90):
+        os.makedirs(store_dir, exist_ok=True)
+        self.store_dir = store_dir
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+
+        self._file = open(os.path.join(store_dir, MjpegStore.DATA), "wb")
+        self._offset = 0
+        self._index = []
+
+    def append(self, frame, timestamp_sec):
+        ok, buf = cv2.imencode(".jpg", frame, self.params)
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+
+        data = buf.tobytes()
+        self._file.write(data)
+        self._index.append((self._offset, len(data), timestamp_sec))
+        self._offset += len(data)
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self, **meta):
+        self._file.close()
+
+        index = np.array(self._index, dtype=np.float64).reshape(-1, 3)
+        np.save(os.path.join(self.store_dir, MjpegStore.INDEX), index)
+
+        with open(os.path.join(self.store_dir, MjpegStore.META), "w") as f:
+            json.dump(dict(meta, frames=len(self._index)), f, indent=4)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MjpegStore:
+    """
+    Reader for MjpegWriter output. The index is loaded once; time slicing
+    is a binary search over it (no directory listing) and a frame is one
+    decode of a memory-mapped byte range.
+    """
+
+    DATA = "frames.mjpeg"
+    INDEX = "frames.index.npy"
+    META = "frames.meta.json"
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+
+        index = np.load(os.path.join(store_dir, self.INDEX))
+        self.offsets = index[:, 0].astype(np.int64)
+        self.lengths = index[:, 1].astype(np.int64)
+        self.timestamps = index[:, 2]
+
+        self._file = open(os.path.join(store_dir, self.DATA), "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if len(self.offsets) else None
+
+    @classmethod
+    def exists(cls, store_dir):
+        return os.path.exists(os.path.join(store_dir, cls.INDEX))
+
+    def __len__(self):
+        return len(self.offsets)
+
+    # -------------------------------
+    # Access
+    # -------------------------------
+    def read(self, i):
+        start = self.offsets[i]
+        data = np.frombuffer(self._map, dtype=np.uint8, count=self.lengths[i], offset=start)
+        return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+    def index_range(self, start_sec, end_sec):
+        """
+        range of frame indices with start_sec <= t < end_sec
+        """
+        lo = int(np.searchsorted(self.timestamps, start_sec, side="left"))
+        hi = int(np.searchsorted(self.timestamps, end_sec, side="left"))
+        return range(lo, hi)
+
+    def iter_frames(self, start_sec=None, end_sec=None):
+        """
+        Yields (timestamp_sec, frame)
+        """
+        indices = self.index_range(
+            -np.inf if start_sec is None else start_sec,
+            np.inf if end_sec is None else end_sec
+        )
+        for i in indices:
+            yield float(self.timestamps[i]), self.read(i)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
@@ -0,0 +1,164 @@
+import os
+import re
+import json
+import time
+import shutil
+import threading
+from urllib.parse import urlparse, parse_qs
+
+
+class VideoCache:
+    """
+    Downloaded videos keyed by canonical source ID (YouTube video ID or
+    Google Drive file ID), so a re-queued / re-analyzed session with the
+    same link does not download again.
+
+    <cache_dir>/<key><ext> + index.json {key: {file, size, last_access}};
+    least recently used entries are evicted above max_bytes. Sessions get a
+    hardlink (symlink, copy as fallbacks) into their own folder.
+    """
+
+    INDEX = "index.json"
+
+    def __init__(self, cache_dir, max_gb=200):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_gb * 1024 ** 3
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # -------------------------------
+    # Canonical keys
+    # -------------------------------
+    @staticmethod
+    def source_key(src):
+        """
+        "yt-<id>" / "drive-<id>", or None for sources we cannot identify
+        """
+        url = urlparse(src)
+        host = url.netloc.lower()
+
+        if host.endswith("youtu.be"):
+            vid = url.path.strip("/").split("/")[0]
+            return f"yt-{vid}" if vid else None
+
+        if "youtube.com" in host:
+            vid = parse_qs(url.query).get("v", [None])[0]
+            if not vid:
+                # /live/<id>, /shorts/<id>, /embed/<id>
+                match = re.match(r"/(?:live|shorts|embed)/([\w-]+)", url.path)
+                vid = match.group(1) if match else None
+            return f"yt-{vid}" if vid else None
+
+        if "drive.google.com" in host:
+            match = re.search(r"/d/([\w-]+)", url.path)
+            fid = match.group(1) if match else parse_qs(url.query).get("id", [None])[0]
+            return f"drive-{fid}" if fid else None
+
+        return None
+
+    # -------------------------------
+    # Index
+    # -------------------------------
+    def _index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX)
+
+    def _load(self):
+        try:
+            with open(self._index_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, index):
+        tmp = self._index_path() + f".{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(index, f, indent=4)
+        os.replace(tmp, self._index_path())
+
+    # -------------------------------
+    # Public
+    # -------------------------------
+    def lookup(self, src):
+        """
+        Cached file path for src (and marks it used), or None
+        """
+        key = self.source_key(src)
+        if key is None:
+            return None
+
+        with self._lock:
+            index = self._load()
+            entry = index.get(key)
+            if entry is None:
+                return None
+
+            path = os.path.join(self.cache_dir, entry["file"])
+            if not os.path.exists(path):
+                del index[key]
+                self._save(index)
+                return None
+
+            entry["last_access"] = time.time()
+            self._save(index)
+            return path
+
+    def store(self, src, video_path):
+        """
+        Moves a finished download into the cache; returns the cached path
+        (video_path unchanged if src has no canonical key)
+        """
+        key = self.source_key(src)
+        if key is None:
+            return video_path
+
+        filename = key + os.path.splitext(video_path)[1]
+        cached = os.path.join(self.cache_dir, filename)
+
+        with self._lock:
+            shutil.move(video_path, cached)
+
+            index = self._load()
+            index[key] = {
+                "file": filename,
+                "size": os.path.getsize(cached),
+                "last_access": time.time()
+            }
+            self._evict(index, keep=key)
+            self._save(index)
+
+        return cached
+
+    def _evict(self, index, keep=None):
+        total = sum(e["size"] for e in index.values())
+
+        for key in sorted(index, key=lambda k: index[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+
+            entry = index.pop(key)
+            try:
+                # Session hardlinks keep their data; only the cache copy goes
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except OSError:
+                pass
+            total -= entry["size"]
+
+    @staticmethod
+    def link_into(cached_path, dest_path):
+        """
+        Session-folder view of a cached file: hardlink → symlink → copy
+        """
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+
+        try:
+            os.link(cached_path, dest_path)
+        except OSError:
+            try:
+                os.symlink(os.path.abspath(cached_path), dest_path)
+            except OSError:
+                shutil.copy2(cached_path, dest_path)
+
+        return os.path.abspath(dest_path)
@@ -5,10 +5,28 @@ import uuid
 import platform
 import subprocess
 import yt_dlp
+from ingestion.video_probe import probe_video
+from ingestion.frame_store import build_frame_store
+from ingestion.mjpeg_store import MjpegWriter
+from ingestion.decoder import open_decoder
 
 class VideoIngestion:
-    def __init__(self, base_dir="data"):
+    def __init__(
+        self,
+        base_dir="data",
+        concurrent_fragments=8,
+        retries=10,
+        duration_tolerance=0.02,
+        cache=None
+    ):
+        """
+        cache: optional VideoCache shared across sessions
+        """
         self.base_dir = base_dir
+        self.cache = cache
+        self.concurrent_fragments = concurrent_fragments
+        self.retries = retries
+        self.duration_tolerance = duration_tolerance
         os.makedirs(base_dir, exist_ok=True)
 
     # -------------------------------
@@ -39,49 +57,91 @@ class VideoIngestion:
     # -------------------------------
     # Download video using yt-dlp
     # -------------------------------
-    def download_video(self, src, output_path):
+    def _ydl_opts(self, output_path, **extra):
         opts = {
             "outtmpl": output_path,
             "quiet": False,  # Show download progress
             "format": "best[ext=mp4]/best",  # Prefer mp4
+            # Parallel DASH/HLS fragments
+            "concurrent_fragment_downloads": self.concurrent_fragments,
+            # Resume <file>.part after a crash instead of starting over
+            "continuedl": True,
+            "nopart": False,
+            "overwrites": False,
+            "retries": self.retries,
+            "fragment_retries": self.retries,
         }
+        opts.update(extra)
+        return opts
+
+    def _find_output(self, ydl, info, output_path):
+        # yt-dlp might change the extension, so find the actual file
+        actual_filename = ydl.prepare_filename(info)
+        
+        print(f"yt-dlp saved file as: {actual_filename}")
+        
+        # If the filename is different from expected, use the actual one
+        if os.path.exists(actual_filename):
+            return os.path.abspath(os.path.normpath(actual_filename))
+        
+        # Otherwise check if output_path exists
+        if os.path.exists(output_path):
+            return os.path.abspath(os.path.normpath(output_path))
+        
+        # Check for common extensions yt-dlp might add
+        for ext in ['.mkv', '.webm', '.m4a', '.mp4']:
+            check_path = output_path + ext
+            if os.path.exists(check_path):
+                print(f"Found video with extension: {ext}")
+                return os.path.abspath(os.path.normpath(check_path))
         
+        # Last resort: check the directory for any video file
+        video_dir = os.path.dirname(output_path)
+        files = os.listdir(video_dir)
+        print(f"Files in directory: {files}")
+        
+        for f in files:
+            if f.startswith('video') and any(f.endswith(e) for e in ['.mp4', '.mkv', '.webm']):
+                found_path = os.path.join(video_dir, f)
+                print(f"Found video file: {found_path}")
+                return os.path.abspath(os.path.normpath(found_path))
+        
+        return None
+
+    def verify_download(self, path, info, expected_duration=None):
+        """
+        A truncated file (killed mid-merge, short final fragment) still
+        opens, so compare its probed duration with what the source reports
+        and its size with the advertised size when known.
+        """
+        probe = probe_video(path)
+        expected_duration = expected_duration or (info or {}).get("duration")
+
+        if expected_duration:
+            missing = expected_duration - probe["duration"]
+            if missing > max(2.0, self.duration_tolerance * expected_duration):
+                print(f"❌ Download truncated: {probe['duration']:.1f}s of {expected_duration:.1f}s")
+                return False
+
+        expected_size = (info or {}).get("filesize")
+        if expected_size and os.path.getsize(path) < expected_size * (1 - self.duration_tolerance):
+            print(f"❌ Download too small: {os.path.getsize(path)} of {expected_size} bytes")
+            return False
+
+        return True
+
+    def download_video(self, src, output_path, expected_duration=None, **extra_opts):
         try:
-            with yt_dlp.YoutubeDL(opts) as ydl:
+            with yt_dlp.YoutubeDL(self._ydl_opts(output_path, **extra_opts)) as ydl:
                 info = ydl.extract_info(src, download=True)
-                
-                # yt-dlp might change the extension, so find the actual file
-                actual_filename = ydl.prepare_filename(info)
-                
-                print(f"yt-dlp saved file as: {actual_filename}")
-                
-                # If the filename is different from expected, use the actual one
-                if os.path.exists(actual_filename):
-                    return os.path.abspath(os.path.normpath(actual_filename))
-                
-                # Otherwise check if output_path exists
-                if os.path.exists(output_path):
-                    return os.path.abspath(os.path.normpath(output_path))
-                
-                # Check for common extensions yt-dlp might add
-                for ext in ['.mkv', '.webm', '.m4a', '.mp4']:
-                    check_path = output_path + ext
-                    if os.path.exists(check_path):
-                        print(f"Found video with extension: {ext}")
-                        return os.path.abspath(os.path.normpath(check_path))
-                
-                # Last resort: check the directory for any video file
-                video_dir = os.path.dirname(output_path)
-                files = os.listdir(video_dir)
-                print(f"Files in directory: {files}")
-                
-                for f in files:
-                    if f.startswith('video') and any(f.endswith(e) for e in ['.mp4', '.mkv', '.webm']):
-                        found_path = os.path.join(video_dir, f)
-                        print(f"Found video file: {found_path}")
-                        return os.path.abspath(os.path.normpath(found_path))
-                
+                path = self._find_output(ydl, info, output_path)
+
+            if path and not self.verify_download(path, info, expected_duration):
+                # Remove it so the next attempt downloads again
+                os.remove(path)
                 return None
+
+            return path
                 
         except Exception as e:
             print(f"Download error: {e}")
@@ -108,7 +168,10 @@ class VideoIngestion:
             return None
         
     
-    def ingest(self, src, video_id=None):
+    def ingest(self, src, video_id=None, allow_stream=True):
+        """
+        allow_stream=False always downloads (prefetching needs a file on disk)
+        """
         # If a session_id is passed, use it; otherwise generate a random UUID
         if video_id is None:
             video_id = self.generate_video_id()
@@ -127,34 +190,45 @@ class VideoIngestion:
             mode = "local"
             return os.path.abspath(os.path.normpath(src)), video_id, mode
 
+        # Same link already downloaded for another session
+        if self.cache:
+            cached = self.cache.lookup(src)
+            if cached:
+                session_path = os.path.join(video_dir, "video" + os.path.splitext(cached)[1])
+                print(f"♻️ Using cached video: {cached}")
+                return self.cache.link_into(cached, session_path), video_id, "cache"
+
         # Case 2: YouTube
         if self.is_youtube(src):
-            stream = self.try_stream(src)
+            stream = self.try_stream(src) if allow_stream else None
             if stream:
                 return stream, video_id, "stream"
 
             # Download video to the specifically named session folder
             downloaded_path = self.download_video(src, local_video_path)
-            if not downloaded_path or not os.path.exists(downloaded_path):
-                print(f"❌ Download failed: file does not exist")
-                return None, None, None
-            
-            print(f"✅ Downloaded successfully to: {downloaded_path}")
-            return downloaded_path, video_id, "download"
+            return self._finish_download(src, downloaded_path, video_id)
 
         # Case 3: Google Drive
         if self.is_drive(src):
             clean_url = self.resolve_drive_url(src)
             downloaded_path = self.download_video(clean_url, local_video_path)
-            if not downloaded_path or not os.path.exists(downloaded_path):
-                print(f"❌ Download failed: file does not exist")
-                return None, None, None
-            
-            print(f"✅ Downloaded successfully to: {downloaded_path}")
-            return downloaded_path, video_id, "download"
+            return self._finish_download(src, downloaded_path, video_id)
 
         return None, None, None
 
+    def _finish_download(self, src, downloaded_path, video_id):
+        if not downloaded_path or not os.path.exists(downloaded_path):
+            print(f"❌ Download failed: file does not exist")
+            return None, None, None
+
+        if self.cache:
+            cached = self.cache.store(src, downloaded_path)
+            if cached != downloaded_path:
+                self.cache.link_into(cached, downloaded_path)
+
+        print(f"✅ Downloaded successfully to: {downloaded_path}")
+        return downloaded_path, video_id, "download"
+
     # -------------------------------
     # Main ingestion logic
     # -------------------------------
@@ -205,15 +279,44 @@ class VideoIngestion:
     # -------------------------------
     # Extract frames at given FPS
     # -------------------------------
-    def extract_frames(self, video_input, video_id, mode, fps=1):
+    def extract_frames(self, video_input, video_id, mode, fps=1, output="mjpeg", width=640):
+        """
+        Returns the number of frames saved.
+
+        output="mjpeg": frames/frames.mjpeg + offset index (MjpegStore)
+        output="jpg"  : one JPEG per sampled frame in frames/ (legacy)
+        output="store": raw memory-mapped FrameStore in frames.store/
+                        (files only)
+        """
+        if output == "store" and mode in ["download", "local", "cache"]:
+            store = build_frame_store(
+                video_input,
+                os.path.join(self.base_dir, video_id, "frames.store"),
+                fps=fps,
+                width=width
+            )
+            saved = len(store)
+
+            metadata_path = os.path.join(self.base_dir, video_id, "metadata.json")
+            with open(metadata_path, "w") as f:
+                json.dump({"frames": saved, "fps": fps, "format": "store"}, f, indent=4)
+            return saved
+
         frame_dir = os.path.join(self.base_dir, video_id, "frames")
         os.makedirs(frame_dir, exist_ok=True)
 
         saved = 0
+        writer = MjpegWriter(frame_dir) if output == "mjpeg" else None
 
-        if mode in ["download", "local"]:
-            cap = cv2.VideoCapture(video_input)
-            video_fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        def save(frame, timestamp_sec):
+            if writer is not None:
+                writer.append(frame, timestamp_sec)
+            else:
+                cv2.imwrite(os.path.join(frame_dir, f"{saved:05d}.jpg"), frame)
+
+        if mode in ["download", "local", "cache"]:
+            cap = open_decoder(video_input)
+            video_fps = probe_video(video_input)["fps"] or 30
             interval = max(int(video_fps / fps), 1)
 
             frame_count = 0
@@ -222,8 +325,7 @@ class VideoIngestion:
                 if not ret:
                     break
                 if frame_count % interval == 0:
-                    filename = os.path.join(frame_dir, f"{saved:05d}.jpg")
-                    cv2.imwrite(filename, frame)
+                    save(frame, cap.pts_sec())
                     saved += 1
                 frame_count += 1
             cap.release()
@@ -232,9 +334,17 @@ class VideoIngestion:
             # Linux cloud: streaming using FFmpeg + OpenCV
             import numpy as np
 
+            # We need width/height; assume standard 1280x720
+            width, height = 1280, 720
+            frame_size = width * height * 3
+
+            # FFmpeg samples by presentation time: output frame n is the
+            # source frame shown at n / fps (the source rate is unknown here)
             ffmpeg_cmd = [
                 "ffmpeg",
+                "-loglevel", "error",   # stderr is not drained while reading
                 "-i", "pipe:0",
+                "-vf", f"fps={fps},scale={width}:{height}",
                 "-f", "image2pipe",
                 "-pix_fmt", "bgr24",
                 "-vcodec", "rawvideo",
@@ -248,29 +358,24 @@ class VideoIngestion:
                 stderr=subprocess.PIPE
             )
 
-            # We need width/height; assume standard 1280x720
-            width, height = 1280, 720
-            frame_size = width * height * 3
-            frame_count = 0
-
             while True:
                 raw_frame = ffmpeg_process.stdout.read(frame_size)
-                if not raw_frame:
+                if len(raw_frame) < frame_size:
                     break
                 frame = np.frombuffer(raw_frame, np.uint8).reshape((height, width, 3))
-                if frame_count % fps == 0:
-                    filename = os.path.join(frame_dir, f"{saved:05d}.jpg")
-                    cv2.imwrite(filename, frame)
-                    saved += 1
-                frame_count += 1
+                save(frame, saved / fps)
+                saved += 1
 
             ffmpeg_process.stdout.close()
             ffmpeg_process.stderr.close()
             video_input.stdout.close()
 
+        if writer is not None:
+            writer.close(fps=fps)
+
         # Save metadata
         metadata_path = os.path.join(self.base_dir, video_id, "metadata.json")
         with open(metadata_path, "w") as f:
-            json.dump({"frames": saved, "fps": fps}, f, indent=4)
+            json.dump({"frames": saved, "fps": fps, "format": output}, f, indent=4)
 
         return saved
\ No newline at end of file
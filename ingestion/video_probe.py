@@ -0,0 +1,198 @@
+import os
+import json
+import subprocess
+import threading
+import cv2
+from ingestion.decoder import open_decoder
+
+
+class VideoProbe:
+    """
+    Container metadata from ffprobe, computed once per file.
+
+    Results are cached in memory and in a sidecar JSON next to the video
+    (<video>.probe.json), keyed by path, mtime and size, so every precheck
+    and pipeline stage (and later runs) read the same numbers without
+    reopening the file. Falls back to OpenCV when ffprobe is unavailable.
+    """
+
+    _memory = {}
+    _lock = threading.Lock()
+
+    def __init__(self, ffprobe="ffprobe", use_sidecar=True, keyframe_scan_sec=60):
+        self.ffprobe = ffprobe
+        self.use_sidecar = use_sidecar
+        self.keyframe_scan_sec = keyframe_scan_sec
+
+    # -------------------------------
+    # Cache key / sidecar
+    # -------------------------------
+    @staticmethod
+    def _cache_key(video_path):
+        stat = os.stat(video_path)
+        return {
+            "path": os.path.abspath(video_path),
+            "mtime": stat.st_mtime,
+            "size": stat.st_size
+        }
+
+    @staticmethod
+    def sidecar_path(video_path):
+        return video_path + ".probe.json"
+
+    def _read_sidecar(self, video_path, key):
+        try:
+            with open(self.sidecar_path(video_path)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("key") != key:
+            return None
+        return data.get("probe")
+
+    def _write_sidecar(self, video_path, key, info):
+        try:
+            with open(self.sidecar_path(video_path), "w") as f:
+                json.dump({"key": key, "probe": info}, f, indent=4)
+        except OSError:
+            pass
+
+    # -------------------------------
+    # ffprobe
+    # -------------------------------
+    @staticmethod
+    def _parse_rate(rate):
+        try:
+            num, den = rate.split("/")
+            return float(num) / float(den) if float(den) else 0.0
+        except (AttributeError, ValueError):
+            return 0.0
+
+    def _keyframe_interval(self, video_path):
+        cmd = [
+            self.ffprobe,
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-skip_frame", "nokey",
+            "-read_intervals", f"%+{self.keyframe_scan_sec}",
+            "-show_entries", "frame=pts_time",
+            "-of", "csv=p=0",
+            video_path
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+
+        times = []
+        for line in result.stdout.splitlines():
+            try:
+                times.append(float(line.strip().strip(",")))
+            except ValueError:
+                continue
+
+        if len(times) < 2:
+            return None
+        return (times[-1] - times[0]) / (len(times) - 1)
+
+    def _ffprobe(self, video_path):
+        cmd = [
+            self.ffprobe,
+            "-v", "error",
+            "-print_format", "json",
+            "-show_format",
+            "-show_streams",
+            video_path
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        data = json.loads(result.stdout)
+
+        streams = data.get("streams", [])
+        video = next((s for s in streams if s.get("codec_type") == "video"), None)
+        if video is None:
+            raise ValueError("No video stream")
+
+        fps = self._parse_rate(video.get("avg_frame_rate")) or \
+            self._parse_rate(video.get("r_frame_rate"))
+        duration = float(
+            data.get("format", {}).get("duration")
+            or video.get("duration")
+            or 0.0
+        )
+        nb_frames = video.get("nb_frames")
+
+        return {
+            "duration": duration,
+            "fps": fps,
+            "width": int(video.get("width", 0)),
+            "height": int(video.get("height", 0)),
+            "codec": video.get("codec_name"),
+            "frame_count": int(nb_frames) if nb_frames else int(round(duration * fps)),
+            "keyframe_interval": self._keyframe_interval(video_path),
+            "has_audio": any(s.get("codec_type") == "audio" for s in streams),
+            "source": "ffprobe"
+        }
+
+    @staticmethod
+    def _opencv(video_path):
+        cap = open_decoder(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        info = {
+            "duration": frames / max(fps, 1),
+            "fps": fps,
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "codec": None,
+            "frame_count": int(frames),
+            "keyframe_interval": None,
+            "has_audio": None,
+            "source": "opencv"
+        }
+        cap.release()
+        return info
+
+    # -------------------------------
+    # Public
+    # -------------------------------
+    def probe(self, video_path):
+        """
+        Returns:
+        {
+            "duration", "fps", "width", "height", "codec",
+            "frame_count", "keyframe_interval", "has_audio", "source"
+        }
+        """
+        try:
+            key = self._cache_key(video_path)
+        except OSError:
+            # Not a local file (URL / missing) → no caching
+            return self._opencv(video_path)
+
+        memo_key = (key["path"], key["mtime"], key["size"])
+
+        with self._lock:
+            if memo_key in self._memory:
+                return dict(self._memory[memo_key])
+
+        info = self._read_sidecar(video_path, key) if self.use_sidecar else None
+
+        if info is None:
+            try:
+                info = self._ffprobe(video_path)
+            except (OSError, ValueError, subprocess.CalledProcessError) as e:
+                print(f"ffprobe unavailable or failed ({e}); using OpenCV metadata")
+                info = self._opencv(video_path)
+
+            if self.use_sidecar and info["source"] == "ffprobe":
+                self._write_sidecar(video_path, key, info)
+
+        with self._lock:
+            self._memory[memo_key] = info
+
+        return dict(info)
+
+
+def probe_video(video_path):
+    """
+    Shared entry point used by prechecks and pipeline stages
+    """
+    return VideoProbe().probe(video_path)
@@ -0,0 +1,76 @@
+import cv2
+import numpy as np
+from utils.frame_thumbnail import gray_thumbnail
+
+
+class AdaptiveSampler:
+    """
+    Decides which decoded frames go through pose/movement analysis.
+
+    Runs at base_fps and switches to dense_fps for dense_seconds after
+    trigger() — called when a movement hold starts rising, an audio spike
+    is near, or the motion gate fires.
+    """
+
+    def __init__(
+        self,
+        base_fps=1.0,
+        dense_fps=5.0,
+        dense_seconds=3.0,
+        motion_thresh=6.0,      # mean abs gray diff on the thumbnail
+        thumb_size=(64, 36)
+    ):
+        self.base_interval = 1.0 / base_fps
+        self.dense_interval = 1.0 / dense_fps
+        self.dense_seconds = dense_seconds
+        self.motion_thresh = motion_thresh
+        self.thumb_size = thumb_size
+
+        # -------------------------
+        # State
+        # -------------------------
+        self.dense_until = float("-inf")
+        self.last_sample_sec = None
+        self.prev_thumb = None
+        self.samples = 0
+
+    # --------------------------------------------------
+    def is_dense(self, frame_sec):
+        return frame_sec < self.dense_until
+
+    def trigger(self, frame_sec):
+        self.dense_until = max(self.dense_until, frame_sec + self.dense_seconds)
+
+    # --------------------------------------------------
+    def should_sample(self, frame_sec):
+        """
+        frame_sec: seconds since ANALYSIS WINDOW START of the decoded frame
+        """
+        interval = self.dense_interval if self.is_dense(frame_sec) else self.base_interval
+
+        if (
+            self.last_sample_sec is not None
+            and frame_sec - self.last_sample_sec < interval - 1e-6
+        ):
+            return False
+
+        self.last_sample_sec = frame_sec
+        self.samples += 1
+        return True
+
+    # --------------------------------------------------
+    def motion_gate(self, frame=None, thumb=None):
+        """
+        Cheap global motion check between consecutive SAMPLED frames.
+        thumb: grayscale thumbnail of thumb_size, if the caller has one
+        """
+        if thumb is None:
+            thumb = gray_thumbnail(frame, self.thumb_size)
+
+        prev = self.prev_thumb
+        self.prev_thumb = thumb
+
+        if prev is None:
+            return False
+
+        return float(np.mean(cv2.absdiff(thumb, prev))) > self.motion_thresh
@@ -142,6 +142,7 @@
 
 import numpy as np
 from collections import defaultdict
+from movement.motion_history import MotionHistory
 
 
 class ArmMovement:
@@ -152,16 +153,21 @@ class ArmMovement:
         hold_seconds=0.4,
         fps=25,
         lap_margin=20,
-        min_still_frames=6
+        min_still_frames=6,
+        min_still_seconds=None,
+        motion_interval=None    # seconds; None → diff against previous sample
     ):
         # -------------------------
-        # Config
+        # Config (durations in SECONDS)
         # -------------------------
         self.wrist_thresh = wrist_thresh
         self.elbow_thresh = elbow_thresh
-        self.hold_frames = int(hold_seconds * fps)
+        self.hold_seconds = hold_seconds
         self.lap_margin = lap_margin
-        self.min_still_frames = min_still_frames
+        self.min_still_seconds = (
+            min_still_seconds if min_still_seconds is not None
+            else min_still_frames / fps
+        )
 
         # -------------------------
         # YOLOv8 keypoint indices
@@ -176,16 +182,19 @@ class ArmMovement:
         # -------------------------
         # State
         # -------------------------
-        self.prev_kpts = defaultdict(lambda: None)
-        self.hold_counter = defaultdict(int)
-        self.still_counter = defaultdict(int)
+        self.history = MotionHistory(fps=fps, motion_interval=motion_interval)
+        self.hold_counter = defaultdict(float)     # seconds moving
+        self.still_counter = defaultdict(float)    # seconds still
         self.state = defaultdict(lambda: "STILL")
 
     # ==================================================
     # UPDATE
     # ==================================================
-    def update(self, person_id, keypoints):
+    def update(self, person_id, keypoints, timestamp=None):
         """
+        timestamp: seconds of this sample (any monotonic clock). Without it
+                   every call counts as 1/fps.
+
         Returns:
             "START" | "END" | None
         """
@@ -204,13 +213,14 @@ class ArmMovement:
             if kp[i][0] <= 0 or kp[i][1] <= 0:
                 return None
 
+        now, dt = self.history.resolve(person_id, timestamp)
+        prev = self.history.reference(person_id, now)
+
         # First frame
-        if self.prev_kpts[person_id] is None:
-            self.prev_kpts[person_id] = kp
+        if prev is None:
+            self.history.push(person_id, now, kp)
             return None
 
-        prev = self.prev_kpts[person_id]
-
         # -------------------------
         # Lap suppression
         # -------------------------
@@ -241,29 +251,30 @@ class ArmMovement:
         signal = None
 
         if arm_moving:
-            self.hold_counter[person_id] += 1
-            self.still_counter[person_id] = 0
+            self.hold_counter[person_id] += dt
+            self.still_counter[person_id] = 0.0
         else:
-            self.hold_counter[person_id] = 0
-            self.still_counter[person_id] += 1
+            self.hold_counter[person_id] = 0.0
+            self.still_counter[person_id] += dt
 
         # STILL → MOVING
         if (
             self.state[person_id] == "STILL"
-            and self.hold_counter[person_id] >= self.hold_frames
+            and self.hold_counter[person_id] > 0
+            and self.hold_counter[person_id] >= self.hold_seconds - 1e-6
         ):
             self.state[person_id] = "MOVING"
             signal = "START"
-            self.hold_counter[person_id] = 0
+            self.hold_counter[person_id] = 0.0
 
         # MOVING → STILL
         elif (
             self.state[person_id] == "MOVING"
-            and self.still_counter[person_id] >= self.min_still_frames
+            and self.still_counter[person_id] >= self.min_still_seconds - 1e-6
         ):
             self.state[person_id] = "STILL"
             signal = "END"
-            self.still_counter[person_id] = 0
+            self.still_counter[person_id] = 0.0
 
-        self.prev_kpts[person_id] = kp
+        self.history.push(person_id, now, kp)
         return signal
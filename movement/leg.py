@@ -149,6 +149,7 @@
 
 import numpy as np
 from collections import defaultdict
+from movement.motion_history import MotionHistory
 
 
 class LegMovement:
@@ -167,15 +168,20 @@ class LegMovement:
         knee_dist_thresh=25.0,      # pixels (used as knee movement threshold)
         hold_seconds=1.0,
         fps=25,
-        stable_frames=25
+        stable_frames=25,
+        stable_seconds=None,
+        motion_interval=None        # seconds; None → diff against previous sample
     ):
         # -------------------------
-        # Config (UNCHANGED)
+        # Config (durations in SECONDS)
         # -------------------------
         self.ankle_thresh = ankle_thresh
         self.knee_thresh = knee_dist_thresh
-        self.hold_frames = int(hold_seconds * fps)
-        self.stable_frames = stable_frames
+        self.hold_seconds = hold_seconds
+        self.stable_seconds = (
+            stable_seconds if stable_seconds is not None
+            else stable_frames / fps
+        )
 
         # -------------------------
         # YOLOv8 keypoints
@@ -188,16 +194,19 @@ class LegMovement:
         # -------------------------
         # State
         # -------------------------
-        self.prev_kpts = defaultdict(lambda: None)
-        self.hold_counter = defaultdict(int)
-        self.stable_counter = defaultdict(int)
+        self.history = MotionHistory(fps=fps, motion_interval=motion_interval)
+        self.hold_counter = defaultdict(float)     # seconds moving
+        self.stable_counter = defaultdict(float)   # seconds stable
         self.state = defaultdict(lambda: "STABLE")
 
     # ==================================================
-    # UPDATE (INTERFACE UNCHANGED)
+    # UPDATE
     # ==================================================
-    def update(self, person_id, keypoints):
+    def update(self, person_id, keypoints, timestamp=None):
         """
+        timestamp: seconds of this sample (any monotonic clock). Without it
+                   every call counts as 1/fps.
+
         Returns:
             "START" | "END" | None
         """
@@ -215,13 +224,14 @@ class LegMovement:
             if kp[i][0] <= 0 or kp[i][1] <= 0:
                 return None
 
+        now, dt = self.history.resolve(person_id, timestamp)
+        prev = self.history.reference(person_id, now)
+
         # First frame
-        if self.prev_kpts[person_id] is None:
-            self.prev_kpts[person_id] = kp
+        if prev is None:
+            self.history.push(person_id, now, kp)
             return None
 
-        prev = self.prev_kpts[person_id]
-
         # -------------------------
         # HARD MOVEMENT CHECK
         # -------------------------
@@ -243,30 +253,31 @@ class LegMovement:
         # HOLD / STABILITY LOGIC
         # -------------------------
         if leg_moving:
-            self.hold_counter[person_id] += 1
-            self.stable_counter[person_id] = 0
+            self.hold_counter[person_id] += dt
+            self.stable_counter[person_id] = 0.0
         else:
-            self.hold_counter[person_id] = 0
-            self.stable_counter[person_id] += 1
+            self.hold_counter[person_id] = 0.0
+            self.stable_counter[person_id] += dt
 
         # STABLE → MOVING
         if (
             self.state[person_id] == "STABLE"
-            and self.hold_counter[person_id] >= self.hold_frames
+            and self.hold_counter[person_id] > 0
+            and self.hold_counter[person_id] >= self.hold_seconds - 1e-6
         ):
             self.state[person_id] = "MOVING"
-            self.hold_counter[person_id] = 0
+            self.hold_counter[person_id] = 0.0
             signal = "START"
 
         # MOVING → STABLE
         elif (
             self.state[person_id] == "MOVING"
-            and self.stable_counter[person_id] >= self.stable_frames
+            and self.stable_counter[person_id] >= self.stable_seconds - 1e-6
         ):
             self.state[person_id] = "STABLE"
-            self.stable_counter[person_id] = 0
+            self.stable_counter[person_id] = 0.0
             signal = "END"
 
-        self.prev_kpts[person_id] = kp
+        self.history.push(person_id, now, kp)
         return signal
 
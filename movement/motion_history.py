@@ -0,0 +1,69 @@
+from collections import defaultdict, deque
+
+
+class MotionHistory:
+    """
+    Per-person sample clock shared by the time-based movement detectors.
+
+    - resolve() turns an update's timestamp into (now, dt). Without a
+      timestamp the clock advances by 1/fps, i.e. the old frame counting.
+    - reference() returns the observation to diff against: the previous
+      sample, or with motion_interval the newest one at least that old, so
+      per-sample displacement thresholds mean the same at 0.5, 1 or 5 FPS.
+    """
+
+    def __init__(self, fps=25, motion_interval=None, max_gap_seconds=2.0):
+        self.frame_dt = 1.0 / fps
+        self.motion_interval = motion_interval
+        self.max_gap_seconds = max_gap_seconds
+
+        self.last_ts = {}
+        self.samples = defaultdict(deque)
+
+    # --------------------------------------------------
+    def resolve(self, person_id, timestamp=None):
+        last = self.last_ts.get(person_id)
+
+        if timestamp is None:
+            timestamp = self.frame_dt if last is None else last + self.frame_dt
+
+        if last is None:
+            dt = 0.0
+        else:
+            # Long gaps (person not detected) must not complete a hold at once
+            dt = min(max(timestamp - last, 0.0), self.max_gap_seconds)
+
+        self.last_ts[person_id] = timestamp
+        return timestamp, dt
+
+    # --------------------------------------------------
+    def reference(self, person_id, now):
+        q = self.samples[person_id]
+        if not q:
+            return None
+
+        if self.motion_interval is None:
+            return q[-1][1]
+
+        ref = q[0]
+        for entry in q:
+            if now - entry[0] >= self.motion_interval - 1e-6:
+                ref = entry
+            else:
+                break
+
+        while q[0][0] < ref[0]:
+            q.popleft()
+
+        return ref[1]
+
+    def push(self, person_id, now, observation):
+        q = self.samples[person_id]
+        q.append((now, observation))
+
+        if self.motion_interval is None:
+            while len(q) > 1:
+                q.popleft()
+
+    def has_reference(self, person_id):
+        return bool(self.samples[person_id])
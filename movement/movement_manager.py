@@ -102,27 +102,43 @@
 #         return dict(self.counts)
 
 
+import bisect
 from collections import defaultdict
 from movement.neck_face import FaceNeckMovement
 from movement.arm import ArmMovement
 from movement.leg import LegMovement
 
 class MovementManager:
-    def __init__(self, fps=25):
+    def __init__(self, fps=25, face_mesh=None):
+        """
+        face_mesh: reuse an already built FaceMesh (model registry) instead
+                   of creating one per session
+        """
         self.fps = fps
         self.initialized = False
         self.discontinued_once = set()
 
+        # Candidate seconds from the audio activity timeline
+        self.audio_hints = []
+        self.audio_hint_radius = 0.0
+
 
         # -------------------------
         # Sub-modules
         # -------------------------
+        # fps is the rate the thresholds were tuned at: frame counts below
+        # become seconds at that rate, and displacements are measured over
+        # 1/fps seconds whatever the actual sampling rate is.
+        motion_interval = 1.0 / fps
+
         self.neck = FaceNeckMovement(
             yaw_delta_thresh=6.0,
             pitch_delta_thresh=5.0,
             hold_frames=3,
             cooldown_seconds=2.0,
-            fps=fps
+            fps=fps,
+            motion_interval=motion_interval,
+            face_mesh=face_mesh
         )
 
         self.arm = ArmMovement(
@@ -130,7 +146,8 @@ class MovementManager:
             elbow_thresh=20,
             hold_seconds=0.8,
             fps=fps,
-            lap_margin=20
+            lap_margin=20,
+            motion_interval=motion_interval
         )
 
         self.leg = LegMovement(
@@ -138,7 +155,8 @@ class MovementManager:
             knee_dist_thresh=20,
             hold_seconds=5,
             fps=fps,
-            stable_frames=10
+            stable_frames=10,
+            motion_interval=motion_interval
         )
 
         # -------------------------
@@ -193,7 +211,8 @@ class MovementManager:
             person_id,
             frame,
             face_bbox,
-            draw=draw_debug
+            draw=draw_debug,
+            timestamp=frame_sec
         )
 
         if neck_event == "START":
@@ -212,7 +231,7 @@ class MovementManager:
         # -------------------------
         # ARM
         # -------------------------
-        arm_event = self.arm.update(person_id, keypoints)
+        arm_event = self.arm.update(person_id, keypoints, timestamp=frame_sec)
 
         if arm_event == "START":
             self.counts[person_id]["arm"] += 1
@@ -230,7 +249,7 @@ class MovementManager:
         # -------------------------
         # LEG
         # -------------------------
-        leg_event = self.leg.update(person_id, keypoints)
+        leg_event = self.leg.update(person_id, keypoints, timestamp=frame_sec)
 
         if leg_event == "START":
             self.counts[person_id]["leg"] += 1
@@ -276,6 +295,40 @@ class MovementManager:
         self.discontinued_once.add(person_id)
 
 
+    # --------------------------------------------------
+    def set_audio_hints(self, hint_secs, radius_sec=2.0):
+        """
+        hint_secs: audio spike seconds (relative to ANALYSIS WINDOW START)
+        """
+        self.audio_hints = sorted(hint_secs)
+        self.audio_hint_radius = radius_sec
+
+    def near_audio_hint(self, frame_sec):
+        """
+        True when frame_sec lies within radius of an audio spike, i.e. a
+        second worth sampling densely
+        """
+        i = bisect.bisect_left(self.audio_hints, frame_sec - self.audio_hint_radius)
+        return (
+            i < len(self.audio_hints)
+            and self.audio_hints[i] <= frame_sec + self.audio_hint_radius
+        )
+
+    def movement_rising(self):
+        """
+        True while any hold counter is building up or a movement is open —
+        the adaptive sampler densifies around these moments
+        """
+        for detector in (self.neck, self.arm, self.leg):
+            if any(v > 0 for v in detector.hold_counter.values()):
+                return True
+
+        return any(
+            start_ts is not None
+            for parts in self.active.values()
+            for start_ts in parts.values()
+        )
+
     def get_discontinuities(self):
         return dict(self.timestamps)
 
@@ -112,6 +112,7 @@ import numpy as np
 import mediapipe as mp
 from collections import defaultdict
 import math
+from movement.motion_history import MotionHistory
 
 
 class FaceNeckMovement:
@@ -122,15 +123,26 @@ class FaceNeckMovement:
         hold_frames=3,
         cooldown_seconds=0.6,
         fps=25,
-        min_still_frames=4
+        min_still_frames=4,
+        hold_seconds=None,
+        min_still_seconds=None,
+        motion_interval=None,   # seconds; None → diff against previous sample
+        face_mesh=None          # shared FaceMesh (see yolo.model_registry)
     ):
+        # Durations in SECONDS (frame counts kept for old callers)
         self.yaw_delta_thresh = yaw_delta_thresh
         self.pitch_delta_thresh = pitch_delta_thresh
-        self.hold_frames = hold_frames
-        self.cooldown_frames = int(cooldown_seconds * fps)
-        self.min_still_frames = min_still_frames
+        self.hold_seconds = (
+            hold_seconds if hold_seconds is not None
+            else hold_frames / fps
+        )
+        self.cooldown_seconds = cooldown_seconds
+        self.min_still_seconds = (
+            min_still_seconds if min_still_seconds is not None
+            else min_still_frames / fps
+        )
 
-        self.mp_face = mp.solutions.face_mesh.FaceMesh(
+        self.mp_face = face_mesh if face_mesh is not None else mp.solutions.face_mesh.FaceMesh(
             static_image_mode=False,
             max_num_faces=1,
             refine_landmarks=True,
@@ -141,15 +153,18 @@ class FaceNeckMovement:
         # -------------------------
         # State (per person)
         # -------------------------
-        self.prev_angles = {}
-        self.hold_counter = defaultdict(int)
-        self.still_counter = defaultdict(int)
-        self.cooldown_counter = defaultdict(int)
+        self.history = MotionHistory(fps=fps, motion_interval=motion_interval)
+        self.hold_counter = defaultdict(float)     # seconds moving
+        self.still_counter = defaultdict(float)    # seconds still
+        self.cooldown_until = defaultdict(lambda: float("-inf"))
         self.state = defaultdict(lambda: "STILL")
 
     # --------------------------------------------------
-    def update(self, person_id, frame, face_bbox, draw=False):
+    def update(self, person_id, frame, face_bbox, draw=False, timestamp=None):
         """
+        timestamp: seconds of this sample (any monotonic clock). Without it
+                   every call counts as 1/fps.
+
         Returns:
             "START" | "END" | None
         """
@@ -164,12 +179,14 @@ class FaceNeckMovement:
         if face.size == 0:
             return None
 
+        now, dt = self.history.resolve(person_id, timestamp)
+
         face_rgb = cv2.cvtColor(face, cv2.COLOR_BGR2RGB)
         results = self.mp_face.process(face_rgb)
 
         if not results.multi_face_landmarks:
-            self.still_counter[person_id] += 1
-            self.hold_counter[person_id] = 0
+            self.still_counter[person_id] += dt
+            self.hold_counter[person_id] = 0.0
             return None
 
         lm = results.multi_face_landmarks[0].landmark
@@ -190,18 +207,19 @@ class FaceNeckMovement:
                 py = int(lm[idx].y * (y2 - y1)) + y1
                 cv2.circle(frame, (px, py), 4, (0, 0, 255), -1)
 
+        prev = self.history.reference(person_id, now)
+
         # Init
-        if person_id not in self.prev_angles:
-            self.prev_angles[person_id] = (yaw, pitch)
+        if prev is None:
+            self.history.push(person_id, now, (yaw, pitch))
             return None
 
         # Cooldown active
-        if self.cooldown_counter[person_id] > 0:
-            self.cooldown_counter[person_id] -= 1
-            self.prev_angles[person_id] = (yaw, pitch)
+        if now <= self.cooldown_until[person_id] + 1e-6:
+            self.history.push(person_id, now, (yaw, pitch))
             return None
 
-        prev_yaw, prev_pitch = self.prev_angles[person_id]
+        prev_yaw, prev_pitch = prev
         dyaw = abs(yaw - prev_yaw)
         dpitch = abs(pitch - prev_pitch)
 
@@ -214,22 +232,23 @@ class FaceNeckMovement:
         # Counters
         # -------------------------
         if moving:
-            self.hold_counter[person_id] += 1
-            self.still_counter[person_id] = 0
+            self.hold_counter[person_id] += dt
+            self.still_counter[person_id] = 0.0
         else:
-            self.hold_counter[person_id] = 0
-            self.still_counter[person_id] += 1
+            self.hold_counter[person_id] = 0.0
+            self.still_counter[person_id] += dt
 
         # -------------------------
         # STILL → MOVING
         # -------------------------
         if (
             self.state[person_id] == "STILL"
-            and self.hold_counter[person_id] >= self.hold_frames
+            and self.hold_counter[person_id] > 0
+            and self.hold_counter[person_id] >= self.hold_seconds - 1e-6
         ):
             self.state[person_id] = "MOVING"
-            self.cooldown_counter[person_id] = self.cooldown_frames
-            self.hold_counter[person_id] = 0
+            self.cooldown_until[person_id] = now + self.cooldown_seconds
+            self.hold_counter[person_id] = 0.0
             return "START"
 
         # -------------------------
@@ -237,12 +256,12 @@ class FaceNeckMovement:
         # -------------------------
         if (
             self.state[person_id] == "MOVING"
-            and self.still_counter[person_id] >= self.min_still_frames
+            and self.still_counter[person_id] >= self.min_still_seconds - 1e-6
         ):
             self.state[person_id] = "STILL"
             return "END"
 
-        self.prev_angles[person_id] = (yaw, pitch)
+        self.history.push(person_id, now, (yaw, pitch))
         return None
     
     # --------------------------------------------------
@@ -19,21 +19,41 @@ from prechecks.participant_check import ParticipantCheck
 
 from audio.audio_marker import AudioMarker
 from movement.movement_manager import MovementManager
+from movement.adaptive_sampler import AdaptiveSampler
 from reporting.report_builder import ReportBuilder
 # from runtime_checks.freeze_monitor import RuntimeFreezeMonitor
 # from runtime_checks.participant_discontinuity import ParticipantDiscontinuity
-from yolo.inference import YOLOPoseDetector
+from yolo.model_registry import get_pose_detector, get_face_mesh
 from tracking.iou_tracker import IOUTracker
 from identity.role_assigner import RoleAssigner
 from reporting.pdf_generator import generate_participant_pdf
 from reporting.timestamp_converter import convert_movement_timestamps
+from reporting.error_mapper import map_error
 from runtime_checks.freeze_monitor import RuntimeFreezeMonitor
 from runtime_checks.participant_discontinuity import ParticipantDiscontinuity
+from runtime_checks.illumination_monitor import RuntimeIlluminationMonitor
+from utils.frame_thumbnail import gray_thumbnail
+from ingestion.video_probe import probe_video
+from ingestion.decoder import open_decoder
+from pipeline.checkpoint import Checkpointer, config_fingerprint
 
 
-def analyze_video(video_path, session_id, participant_ids):
+START_REF_AUDIO = os.getenv(
+    "START_REF_AUDIO",
+    r"D:\Meditation proctor\reference_audio\start_audio.wav"
+)
+END_REF_AUDIO = os.getenv(
+    "END_REF_AUDIO",
+    r"D:\Meditation proctor\reference_audio\end_audio.wav"
+)
+
+
+def analyze_video(video_path, session_id, participant_ids, progress_callback=None):
     """
     Main production entrypoint
+
+    progress_callback(processed_sec, window_sec): optional, called once per
+    processed minute of the analysis window
     """
     # 🔑 HARD GUARANTEE
     video_path = os.path.abspath(video_path)
@@ -44,116 +64,230 @@ def analyze_video(video_path, session_id, participant_ids):
     print("ANALYZE INPUT:", video_path, type(video_path))
 
     # --------------------------------------------------
-    # 1. PRECHECKS (HARD FAILS)
+    # 1. AUDIO WINDOW DETECTION (FAST FAIL, NO VIDEO DECODE)
     # --------------------------------------------------
-    checks = [
-        VideoAccessCheck(),
-        IlluminationCheck(),
-        VideoMetadataCheck(min_duration_sec=2.75 * 3600),
-        TimestampCheck(required_year=2026),
-        FreezeCheck(sample_frames=15 * 60),
-        ParticipantCheck()
-    ]
-
-    prechecks = PrecheckManager(checks)
-    precheck_result = prechecks.run_all(video_path)
+    audio_marker = AudioMarker()
 
-    if not precheck_result["passed"]:
+    # Cheap open check first: a missing / unreadable file must fail as
+    # VIDEO_NOT_ACCESSIBLE, not as an ffmpeg error from audio extraction
+    access = VideoAccessCheck().run(video_path)
+    if not access.ok:
         return {
             "status": "FAILED",
-            "errors": precheck_result["errors"]
+            "errors": [map_error(access.error_code)]
         }
 
+    # Killed mid-run before? Resume from the session folder checkpoint
+    # (audio window and prechecks were already done then)
+    checkpointer = Checkpointer(os.path.dirname(video_path))
+    resume = checkpointer.load(video_path)
+
+    if resume:
+        start_sec, end_sec = resume["window"]
+        print(f"Resuming from checkpoint at {resume['position']['resume_sec']:.1f}s")
+    else:
+        try:
+            start_sec, end_sec = audio_marker.get_analysis_window(
+                video_path,
+                start_ref=START_REF_AUDIO,
+                end_ref=END_REF_AUDIO
+            )
+        except Exception as e:
+            return {
+                "status": "FAILED",
+                "errors": [{
+                    "code": "AUDIO_MARKER_ERROR",
+                    "message": str(e)
+                }]
+            }
+
+    # Shared pose model (registry): used by ParticipantCheck and the frame loop
+    detector = get_pose_detector(
+        weights="yolov8n-pose.pt",
+        conf=0.6,
+        imgsz=640
+    )
+
     # --------------------------------------------------
-    # 2. AUDIO WINDOW DETECTION
+    # 2. PRECHECKS (HARD FAILS, SAMPLED INSIDE AUDIO WINDOW)
     # --------------------------------------------------
-    audio_marker = AudioMarker()
-    try:
-        start_sec, end_sec = audio_marker.get_analysis_window(
+    checks = [
+        VideoAccessCheck(),
+        IlluminationCheck(),
+        VideoMetadataCheck(min_duration_sec=2.75 * 3600),
+        TimestampCheck(required_year=2026),
+        FreezeCheck(probes=12, burst_frames=5),
+        ParticipantCheck(samples=3, detector=detector)
+    ]
+
+    if not resume:
+        prechecks = PrecheckManager(checks)
+        precheck_result = prechecks.run_all(
             video_path,
-            start_ref=r"D:\Meditation proctor\reference_audio\start_audio.wav",
-            end_ref=r"D:\Meditation proctor\reference_audio\end_audio.wav"
+            window=(start_sec, end_sec)
         )
-    except Exception as e:
-        return {
-            "status": "FAILED",
-            "errors": [{
-                "code": "AUDIO_MARKER_ERROR",
-                "message": str(e)
-            }]
-        }
+
+        if not precheck_result["passed"]:
+            return {
+                "status": "FAILED",
+                "errors": precheck_result["errors"]
+            }
 
     # --------------------------------------------------
     # 3. INITIALIZE PIPELINE COMPONENTS
     # --------------------------------------------------
-    detector = YOLOPoseDetector(
-        weights="yolov8n-pose.pt",
-        conf=0.6,
-        imgsz=640
-    )
-
     tracker = IOUTracker(iou_thresh=0.3)
     role_assigner = RoleAssigner()
-    movement_manager = MovementManager(fps=1)
+    # Warm FaceMesh from the registry, tracking context reset for this session
+    movement_manager = MovementManager(fps=1, face_mesh=get_face_mesh(reset=True))
 
-    cap = cv2.VideoCapture(video_path)
-    fps = cap.get(cv2.CAP_PROP_FPS)
+    cap = open_decoder(video_path)
+    fps = probe_video(video_path)["fps"] or cap.get(cv2.CAP_PROP_FPS)
 
-    FRAME_STRIDE = int(fps)  # 1 FPS processing
-    frame_idx = 0
+    # 1 FPS base, 5 FPS around rising movements / audio spikes / motion
+    sampler = AdaptiveSampler(base_fps=1.0, dense_fps=5.0, dense_seconds=3.0)
+    reported_min = 0
 
     freeze_monitor = RuntimeFreezeMonitor(
         freeze_seconds=15 * 60,  # 15 minutes
-        fps=1                   # because FRAME_STRIDE = fps → 1 FPS
+        fps=1,                   # fallback only; timestamps are passed
+        max_hamming=10
+    )
+
+    illumination_monitor = RuntimeIlluminationMonitor(
+        black_seconds=15 * 60,   # same limit as the freeze monitor
+        dark_seconds=15 * 60
     )
 
     participant_monitor = ParticipantDiscontinuity(
         max_absent_seconds=15,   # configurable
-        fps=1                    # because FRAME_STRIDE = fps → 1 FPS
+        fps=1                    # base sampling rate
     )
 
 
-    start_frame = int(start_sec * fps)
-    end_frame = int(end_sec * fps)
-
-    
+    # Everything the frame loop accumulates (checkpointed together)
+    components = {
+        "tracker": tracker,
+        "role_assigner": role_assigner,
+        "movement_manager": movement_manager,
+        "participant_monitor": participant_monitor,
+        "freeze_monitor": freeze_monitor,
+        "illumination_monitor": illumination_monitor,
+        "sampler": sampler
+    }
+    # Settings only: taken before any runtime state (audio hints, restored
+    # checkpoint) is put into the components
+    config = config_fingerprint(components)
+
+    # Time comes from each frame's PTS (VFR recordings drift by seconds
+    # over 3 h with frame_idx / fps, audio markers are real time)
+    seek_sec = start_sec
+    resumed = bool(resume) and checkpointer.restore(components, resume, config)
+
+    if resumed:
+        seek_sec = resume["position"]["resume_sec"]
+        reported_min = resume["position"]["reported_min"]
+    elif resume:
+        print("Checkpoint written with other settings, frame loop restarts at window start")
+
+    # Audio activity timeline → candidate seconds for dense sampling
+    # (restored with the movement manager when resuming)
+    if not resumed:
+        try:
+            activity = audio_marker.analyze_activity(start_sec, end_sec)
+            movement_manager.set_audio_hints(activity["spikes"])
+            print(f"Audio activity spikes: {len(activity['spikes'])}")
+        except Exception as e:
+            print(f"Audio activity timeline skipped: {e}")
+
+    # Seek lands on the frame at/before seek_sec → skip up to it
+    # (no frame rate in the container → no half-frame tolerance)
+    skip_before_sec = seek_sec - (0.5 / fps if fps else 0.0)
+
+    # ⛔ Skip before analysis window (seek instead of decoding up to it)
+    cap.set(cv2.CAP_PROP_POS_MSEC, seek_sec * 1000.0)
 
     # --------------------------------------------------
     # 4. FRAME LOOP (STRICTLY INSIDE AUDIO WINDOW)
     # --------------------------------------------------
     while cap.isOpened():
 
-        ret, frame = cap.read()
+        # grab() only; pixels are retrieved for sampled frames
+        if not cap.grab():
+            break
+
+        pts_sec = cap.pts_sec()
+
+        if pts_sec < skip_before_sec:
+            continue
+
+        # ⛔ Stop after window
+        if pts_sec > end_sec:
+            break
+
+        # Seconds since window start, from the frame's presentation time
+        video_timestamp_sec = pts_sec - start_sec
+
+        # State here covers every frame before this one → resume re-reads it
+        if checkpointer.due():
+            checkpointer.save(
+                video_path,
+                window=(start_sec, end_sec),
+                position={"resume_sec": pts_sec, "reported_min": reported_min},
+                components=components,
+                config=config
+            )
+
+        if movement_manager.near_audio_hint(video_timestamp_sec):
+            sampler.trigger(video_timestamp_sec)
+
+        # ⛔ Adaptive downsampling
+        if not sampler.should_sample(video_timestamp_sec):
+            continue
+
+        ret, frame = cap.retrieve()
         if not ret:
             break
 
-        # 🔴 Runtime freeze detection
-        freeze_error = freeze_monitor.update(frame)
+        thumb = gray_thumbnail(frame)
+
+        # 🔴 Runtime freeze detection (sampled frames, seconds-based)
+        freeze_error = freeze_monitor.update(
+            frame=frame,
+            timestamp=video_timestamp_sec,
+            thumb=thumb
+        )
         if freeze_error:
             cap.release()
+            checkpointer.clear()
             return {
                 "status": "FAILED",
                 "errors": [freeze_error]
             }
 
+        # 🔴 Black / dark screen timeline
+        usable, light_error = illumination_monitor.update(thumb, video_timestamp_sec)
+        if light_error:
+            cap.release()
+            checkpointer.clear()
+            return {
+                "status": "FAILED",
+                "errors": [light_error]
+            }
 
-        frame_idx += 1
-
-        # ⛔ Skip before analysis window
-        if frame_idx < start_frame:
-            continue
+        if int(video_timestamp_sec // 60) > reported_min:
+            reported_min = int(video_timestamp_sec // 60)
+            print(f"Processed {reported_min * 60} seconds ({sampler.samples} samples)...")
+            if progress_callback:
+                progress_callback(reported_min * 60, end_sec - start_sec)
 
-        # ⛔ Stop after window
-        if frame_idx > end_frame:
-            break
+        if sampler.motion_gate(thumb=thumb):
+            sampler.trigger(video_timestamp_sec)
 
-        # ⛔ FPS downsampling
-        if frame_idx % FRAME_STRIDE != 0:
+        # ⛔ Nothing to see → skip pose inference
+        if not usable:
             continue
 
-        if frame_idx % (FRAME_STRIDE * 60) == 0:
-            print(f"Processed {(frame_idx - start_frame) // FRAME_STRIDE} seconds...")
-
         detections = detector.detect(frame)
 
         # -------------------------------
@@ -210,8 +344,6 @@ def analyze_video(video_path, session_id, participant_ids):
             face_y2 = y1 + int(0.4 * (y2 - y1))
             face_bbox = (x1, y1, x2, face_y2)
 
-            video_timestamp_sec = (frame_idx - start_frame) / fps
-
             movement_manager.update(
                 person_id=person_id,
                 frame=frame,
@@ -227,6 +359,9 @@ def analyze_video(video_path, session_id, participant_ids):
             )               
 
 
+        if movement_manager.movement_rising():
+            sampler.trigger(video_timestamp_sec)
+
         # -------------------------------
         # PARTICIPANT QUIT Marker
         # -------------------------------
@@ -245,12 +380,14 @@ def analyze_video(video_path, session_id, participant_ids):
 
 
     cap.release()
+    cap.report("Frame loop decode")
+    checkpointer.clear()
 
     # --------------------------------------------------
     # 5. TIMESTAMP CONVERSION (CRITICAL STEP)
     # --------------------------------------------------
     movement_manager.finalize(
-        end_frame_sec=(end_frame - start_frame) / fps
+        end_frame_sec=end_sec - start_sec
     )
     
     raw_timestamps = movement_manager.get_timestamps()
@@ -313,7 +450,8 @@ def analyze_video(video_path, session_id, participant_ids):
     return {
         "status": "SUCCESS",
         "participants": final_report,
-        "pdf_reports": pdf_reports
+        "pdf_reports": pdf_reports,
+        "dark_segments": illumination_monitor.get_segments()
     }
     
   
@@ -11,7 +11,9 @@ from dotenv import load_dotenv
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from ingestion.video_ingestion import VideoIngestion
+from ingestion.video_cache import VideoCache
 from pipeline.analyze_video import analyze_video
+from pipeline.prefetcher import run_with_prefetch
 
 # --- 1. CONFIGURATION ---
 load_dotenv()
@@ -25,47 +27,61 @@ PDF_BASE_DIR = os.path.normpath(os.getenv("PDF_REPORT_DIR"))
 os.makedirs(VIDEO_BASE_DIR, exist_ok=True)
 os.makedirs(PDF_BASE_DIR, exist_ok=True)
 
+# Downloads shared by sessions with the same link (hardlinked per session)
+VIDEO_CACHE = VideoCache(
+    os.getenv("VIDEO_CACHE_DIR", os.path.join(VIDEO_BASE_DIR, ".cache")),
+    max_gb=float(os.getenv("VIDEO_CACHE_GB", 200))
+)
+
 HEADERS = {
     "Authorization": f"Bearer {AUTH_TOKEN}",
     "Content-Type": "application/json"
 }
 
-def process_session(session_data):
+def ingest_session(session_data, allow_stream=True):
     """
-    Handles the full workflow for a specific session
+    Step 1 only: downloads the session video into videos/[session_id]/.
+    Returns the local video path, or None on failure.
     """
     youtube_url = session_data.get("youtubeLink")
     session_id = session_data.get("_id")
-    participant_ids = session_data.get("participantsId", [])
 
-    print(f"\n🚀 Processing Session: {session_id}")
-    print(f"🔗 Link: {youtube_url}")
-    
-    video_path = None
-    try:
-        # --- 2. INGESTION (Saves video in videos/[session_id]/) ---
-        print("▶ Step 1: Ingesting Video with Session ID...")
-        ingestor = VideoIngestion(base_dir=VIDEO_BASE_DIR)
-        
-        # We pass session_id to ensure the folder is named correctly
-        path, _, mode = ingestor.ingest(youtube_url, video_id=session_id)
-        
-        if not path:
-            print(f"❌ Error: Ingestion failed for session {session_id}")
-            return
+    print("▶ Step 1: Ingesting Video with Session ID...")
+    ingestor = VideoIngestion(base_dir=VIDEO_BASE_DIR, cache=VIDEO_CACHE)
 
-        video_path = os.path.abspath(os.path.normpath(path))
-        
-        if not os.path.exists(video_path):
-            print(f"❌ Error: Video file not found at: {video_path}")
-            return
-            
-        print(f"✅ Video saved at: {video_path}")
+    # We pass session_id to ensure the folder is named correctly
+    path, _, mode = ingestor.ingest(youtube_url, video_id=session_id, allow_stream=allow_stream)
+
+    if not path:
+        print(f"❌ Error: Ingestion failed for session {session_id}")
+        return None
 
+    video_path = os.path.abspath(os.path.normpath(path))
+
+    if not os.path.exists(video_path):
+        print(f"❌ Error: Video file not found at: {video_path}")
+        return None
+
+    print(f"✅ Video saved at: {video_path}")
+    return video_path
+
+def analyze_session(session_data, video_path, progress_callback=None):
+    """
+    Steps 2-3: analysis of an already ingested session video
+    """
+    session_id = session_data.get("_id")
+    participant_ids = session_data.get("participantsId", [])
+
+    try:
         # --- 3. ANALYSIS (Passes session_id and participant_ids) ---
         print("▶ Step 2: Running AI Analysis & Mapping PDFs...")
         # analyze_video will now create output/[session_id]/ and name PDFs by participant_ids
-        results = analyze_video(video_path, session_id, participant_ids)
+        results = analyze_video(
+            video_path,
+            session_id,
+            participant_ids,
+            progress_callback=progress_callback
+        )
         
         if results["status"] == "FAILED":
             print(f"❌ Analysis failed for {session_id}:")
@@ -91,30 +107,60 @@ def process_session(session_data):
             session_folder = os.path.dirname(video_path)
             print(f"🧹 Session folder kept at: {os.path.normpath(session_folder)}")
 
-def get_job_and_process():
+def process_session(session_data, progress_callback=None):
     """
-    Polls the API for queued jobs and triggers processing
+    Handles the full workflow for a specific session
+    """
+    session_id = session_data.get("_id")
+
+    print(f"\n🚀 Processing Session: {session_id}")
+    print(f"🔗 Link: {session_data.get('youtubeLink')}")
+
+    try:
+        video_path = ingest_session(session_data)
+    except Exception as e:
+        print(f"❌ Unexpected Error in session {session_id}: {e}")
+        import traceback
+        traceback.print_exc()
+        return
+
+    if video_path:
+        analyze_session(session_data, video_path, progress_callback=progress_callback)
+
+def fetch_queued_jobs(timeout=30):
+    """
+    Returns the sessions with status "queued".
+    Raises on connection / API errors so callers can back off.
     """
     url = f"{API_BASE_URL}/proctoringTool/queuedJobs"
     print(f"📡 Polling API: {url}")
-    
+
+    response = requests.get(url, headers=HEADERS, timeout=timeout)
+    if response.status_code != 200:
+        raise RuntimeError(f"API Error {response.status_code}: {response.text}")
+
+    sessions = response.json().get("sessions", [])
+    return [s for s in sessions if s.get("status") == "queued"]
+
+def get_job_and_process():
+    """
+    Polls the API for queued jobs and triggers processing
+    """
     try:
-        response = requests.get(url, headers=HEADERS)
-        if response.status_code == 200:
-            data = response.json()
-            sessions = data.get("sessions", [])
-            
-            queued_jobs = [s for s in sessions if s.get("status") == "queued"]
-            
-            if queued_jobs:
-                print(f"🔔 Found {len(queued_jobs)} queued job(s).")
-                # Process the first job in the queue
-                process_session(queued_jobs[0])
-            else:
-                print("ℹ️ No queued jobs found.")
+        queued_jobs = fetch_queued_jobs()
+
+        if queued_jobs:
+            print(f"🔔 Found {len(queued_jobs)} queued job(s).")
+            # Analyze in queue order; the next video downloads meanwhile
+            run_with_prefetch(
+                queued_jobs,
+                ingest_fn=lambda job: ingest_session(job, allow_stream=False),
+                analyze_fn=analyze_session,
+                base_dir=VIDEO_BASE_DIR
+            )
         else:
-            print(f"❌ API Error {response.status_code}: {response.text}")
-            
+            print("ℹ️ No queued jobs found.")
+
     except Exception as e:
         print(f"❌ Connection Error: {e}")
 
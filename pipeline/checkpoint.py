@@ -0,0 +1,188 @@
+import os
+import time
+import pickle
+import hashlib
+from collections import defaultdict
+
+# Instances of these packages are captured attribute by attribute
+PROJECT_PACKAGES = {"movement", "tracking", "identity", "runtime_checks"}
+
+# Live handles that cannot (and need not) be saved
+SKIP_ATTRS = {"mp_face", "face_mesh"}
+
+CONFIG_TYPES = (int, float, str, bool, type(None))
+
+
+class _ObjectState:
+    def __init__(self, attrs):
+        self.attrs = attrs
+
+
+class _DefaultDictState:
+    # defaultdict(lambda: ...) does not pickle; the live object keeps its
+    # factory and only the items are restored into it
+    def __init__(self, items):
+        self.items = items
+
+
+def _is_project_object(value):
+    return type(value).__module__.split(".")[0] in PROJECT_PACKAGES and hasattr(value, "__dict__")
+
+
+def _capture_value(value):
+    if isinstance(value, defaultdict):
+        return _DefaultDictState(dict(value))
+    if _is_project_object(value):
+        return _ObjectState(capture_state(value))
+    return value
+
+
+def capture_state(obj):
+    return {
+        name: _capture_value(value)
+        for name, value in vars(obj).items()
+        if name not in SKIP_ATTRS
+    }
+
+
+def _config_values(obj):
+    # Scalars of a freshly built object are its settings (thresholds, hold
+    # times, fps ...): its runtime state is still at the initial values
+    values = {"class": f"{type(obj).__module__}.{type(obj).__qualname__}"}
+
+    for name, value in sorted(vars(obj).items()):
+        if name in SKIP_ATTRS:
+            continue
+        if isinstance(value, CONFIG_TYPES):
+            values[name] = value
+        elif isinstance(value, (tuple, list)) and all(isinstance(v, CONFIG_TYPES) for v in value):
+            values[name] = tuple(value)
+        elif _is_project_object(value):
+            values[name] = _config_values(value)
+    return values
+
+
+def config_fingerprint(components):
+    """
+    Hash of the settings of freshly built components. Call it before the
+    first frame: a checkpoint written under other settings (or a code
+    change that adds / renames them) must not be restored.
+    """
+    values = {name: _config_values(obj) for name, obj in sorted(components.items())}
+    return hashlib.sha1(repr(values).encode()).hexdigest()
+
+
+def restore_state(obj, state):
+    for name, value in state.items():
+        current = getattr(obj, name, None)
+
+        if isinstance(value, _ObjectState) and current is not None:
+            restore_state(current, value.attrs)
+        elif isinstance(value, _DefaultDictState) and isinstance(current, defaultdict):
+            current.clear()
+            current.update(value.items)
+        elif isinstance(value, _DefaultDictState):
+            setattr(obj, name, dict(value.items))
+        else:
+            setattr(obj, name, value)
+
+
+class Checkpointer:
+    """
+    Periodic snapshot of the frame loop (position + tracker, roles,
+    movement detectors, runtime monitors) in the session folder, so a
+    killed run resumes where it stopped instead of at frame 0.
+
+    Saves at most every interval_sec of wall time; the interval grows to
+    keep the time spent saving under max_overhead of the run.
+    A checkpoint only matches the same video file (path, size, mtime) and
+    is only restored into components with the same config_fingerprint().
+    """
+
+    FILENAME = "analysis_checkpoint.pkl"
+
+    def __init__(self, session_dir, interval_sec=300, max_overhead=0.01):
+        self.path = os.path.join(session_dir, self.FILENAME)
+        self.interval_sec = interval_sec
+        self.max_overhead = max_overhead
+        self.last_save = time.monotonic()
+        self.enabled = True
+
+    @staticmethod
+    def _video_key(video_path):
+        stat = os.stat(video_path)
+        return (os.path.abspath(video_path), stat.st_size, stat.st_mtime)
+
+    # -------------------------------
+    # Save
+    # -------------------------------
+    def due(self):
+        return self.enabled and time.monotonic() - self.last_save >= self.interval_sec
+
+    def save(self, video_path, window, position, components, config=None):
+        """
+        window     : (start_sec, end_sec) of the analysis window
+        position   : dict, e.g. {"resume_sec": ..., "reported_min": ...}
+        components : {name: object} captured with capture_state
+        config     : config_fingerprint() of the components before the run
+        """
+        started = time.monotonic()
+
+        data = {
+            "video": self._video_key(video_path),
+            "window": window,
+            "position": position,
+            "config": config,
+            "components": {name: capture_state(obj) for name, obj in components.items()}
+        }
+
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"Checkpointing disabled: {e}")
+            self.enabled = False
+            return
+
+        cost = time.monotonic() - started
+        self.interval_sec = max(self.interval_sec, cost / self.max_overhead)
+        self.last_save = time.monotonic()
+
+    # -------------------------------
+    # Resume
+    # -------------------------------
+    def load(self, video_path):
+        """
+        {"window", "position", "config", "components"} of a matching checkpoint, or None
+        """
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+        if data.get("video") != self._video_key(video_path):
+            return None
+        return data
+
+    @staticmethod
+    def restore(components, data, config=None):
+        """
+        False (nothing restored) if the checkpoint was written with other
+        settings than config
+        """
+        if data.get("config") != config:
+            return False
+
+        for name, obj in components.items():
+            if name in data["components"]:
+                restore_state(obj, data["components"][name])
+        return True
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
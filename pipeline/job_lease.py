@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import socket
+import tempfile
+
+
+class JobLease:
+    """
+    File-based job leases so one session is never processed twice.
+
+    A lease is <lease_dir>/<job_id>.lease, created atomically (O_EXCL).
+    Expired leases (crashed worker) can be taken over; the takeover runs
+    under <job_id>.lease.lock (also O_EXCL) so two workers that both saw the
+    stale lease cannot both win.
+    After completion the file is kept as "done" so the job is not picked up
+    again while the API still lists it as queued: until prune_done() sees
+    the job gone from the queue, or for done_ttl_sec if that is set.
+    Put lease_dir on shared storage to coordinate several hosts.
+    """
+
+    def __init__(self, lease_dir, ttl_sec=4 * 3600, done_ttl_sec=None, owner=None,
+                 lock_timeout_sec=60):
+        self.lease_dir = lease_dir
+        self.ttl_sec = ttl_sec
+        self.done_ttl_sec = done_ttl_sec
+        self.lock_timeout_sec = lock_timeout_sec
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        os.makedirs(lease_dir, exist_ok=True)
+
+    def _path(self, job_id):
+        return os.path.join(self.lease_dir, f"{job_id}.lease")
+
+    def _read(self, job_id):
+        try:
+            with open(self._path(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _data(self, state, ttl):
+        return {
+            "owner": self.owner,
+            "state": state,
+            "expires": float("inf") if ttl is None else time.time() + ttl
+        }
+
+    def _write(self, job_id, state, ttl):
+        fd, tmp = tempfile.mkstemp(dir=self.lease_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._data(state, ttl), f)
+        os.replace(tmp, self._path(job_id))
+
+    def _create(self, job_id):
+        try:
+            fd = os.open(self._path(job_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._data("running", self.ttl_sec), f)
+        return True
+
+    def _lock_takeover(self, job_id):
+        """
+        True if this worker may replace the stale lease of job_id.
+        A lock older than lock_timeout_sec belongs to a worker that died
+        mid-takeover and is broken.
+        """
+        lock = self._path(job_id) + ".lock"
+        try:
+            if time.time() - os.path.getmtime(lock) > self.lock_timeout_sec:
+                os.remove(lock)
+        except OSError:
+            pass
+
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            return False
+
+    def _unlock_takeover(self, job_id):
+        try:
+            os.remove(self._path(job_id) + ".lock")
+        except OSError:
+            pass
+
+    def _expired(self, job_id):
+        current = self._read(job_id)
+        return current is not None and current.get("expires", 0) < time.time()
+
+    # -------------------------------
+    # Public
+    # -------------------------------
+    def acquire(self, job_id):
+        """
+        True if this worker now owns job_id
+        """
+        if self._create(job_id):
+            return True
+
+        if not self._expired(job_id) or not self._lock_takeover(job_id):
+            return False
+
+        # Stale lease from a dead worker → take over. Checked again under the
+        # lock: another worker may have taken it over since the first read.
+        try:
+            if not self._expired(job_id):
+                return False
+            try:
+                os.remove(self._path(job_id))
+            except OSError:
+                pass
+            return self._create(job_id)
+        finally:
+            self._unlock_takeover(job_id)
+
+    def renew(self, job_id):
+        current = self._read(job_id)
+        if current and current.get("owner") == self.owner:
+            self._write(job_id, "running", self.ttl_sec)
+
+    def release(self, job_id, done=True):
+        """
+        done=True keeps a "done" marker (see prune_done); False frees the
+        job for an immediate retry
+        """
+        if done:
+            self._write(job_id, "done", self.done_ttl_sec)
+        else:
+            try:
+                os.remove(self._path(job_id))
+            except OSError:
+                pass
+
+    def prune_done(self, queued_ids):
+        """
+        Drops the "done" markers of jobs the API no longer lists as queued
+        """
+        queued_ids = set(queued_ids)
+
+        for name in os.listdir(self.lease_dir):
+            if not name.endswith(".lease"):
+                continue
+            job_id = name[:-len(".lease")]
+            if job_id in queued_ids:
+                continue
+
+            current = self._read(job_id)
+            if current and current.get("state") == "done":
+                try:
+                    os.remove(self._path(job_id))
+                except OSError:
+                    pass
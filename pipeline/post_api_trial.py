@@ -11,7 +11,10 @@ from dotenv import load_dotenv
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from ingestion.video_ingestion import VideoIngestion
+from ingestion.video_cache import VideoCache
 from pipeline.analyze_video import analyze_video
+from pipeline.prefetcher import run_with_prefetch
+from pipeline.report_uploader import ReportUploader
 
 # --- 1. CONFIGURATION ---
 load_dotenv()
@@ -25,102 +28,131 @@ PDF_BASE_DIR = os.path.normpath(os.getenv("PDF_REPORT_DIR"))
 os.makedirs(VIDEO_BASE_DIR, exist_ok=True)
 os.makedirs(PDF_BASE_DIR, exist_ok=True)
 
+# Downloads shared by sessions with the same link (hardlinked per session)
+VIDEO_CACHE = VideoCache(
+    os.getenv("VIDEO_CACHE_DIR", os.path.join(VIDEO_BASE_DIR, ".cache")),
+    max_gb=float(os.getenv("VIDEO_CACHE_GB", 200))
+)
+
 HEADERS = {
     "Authorization": f"Bearer {AUTH_TOKEN}"
 }
 
-def process_session(session_data):
+def ingest_session(session_data, allow_stream=True):
     """
-    Workflow: Ingest -> Analyze -> Upload Reports -> Prepare Final Payload
+    Step 1 only: downloads the session video (videos/[session_id]/).
+    Returns the local video path or None.
     """
     youtube_url = session_data.get("youtubeLink")
     session_id = session_data.get("_id")
-    participant_ids = session_data.get("participantsId", [])
 
-    print(f"--- Processing Session: {session_id} ---")
-    
-    video_path = None
+    print("Step 1: Ingesting Video...")
+    ingestor = VideoIngestion(base_dir=VIDEO_BASE_DIR, cache=VIDEO_CACHE)
+
+    # Pass session_id to ensure video folder matches API ID
+    path, _, _ = ingestor.ingest(youtube_url, video_id=session_id, allow_stream=allow_stream)
+
+    if not path:
+        print("Error: Ingestion failed.")
+        return None
+
+    video_path = os.path.abspath(os.path.normpath(path))
+    print(f"Video saved at: {video_path}")
+    return video_path
+
+def process_session(session_data, progress_callback=None):
+    """
+    Workflow: Ingest -> Analyze -> Upload Reports -> Prepare Final Payload
+    Returns True once the result is submitted.
+    """
+    print(f"--- Processing Session: {session_data.get('_id')} ---")
+
     try:
-        # --- 2. INGESTION (Saves in videos/[session_id]/) ---
-        print("Step 1: Ingesting Video...")
-        ingestor = VideoIngestion(base_dir=VIDEO_BASE_DIR)
-        
-        # Pass session_id to ensure video folder matches API ID
-        path, _, _ = ingestor.ingest(youtube_url, video_id=session_id)
-        
-        if not path:
-            print("Error: Ingestion failed.")
-            return
+        video_path = ingest_session(session_data)
+    except Exception as e:
+        print(f"Unexpected Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    if not video_path:
+        return False
+    return analyze_and_report(session_data, video_path, progress_callback=progress_callback)
 
-        video_path = os.path.abspath(os.path.normpath(path))
-        print(f"Video saved at: {video_path}")
+def analyze_and_report(session_data, video_path, progress_callback=None):
+    """
+    Analyze -> Upload Reports -> Prepare Final Payload for an ingested video.
+    Returns True once the result is submitted (the API then stops listing
+    the session as queued).
+    """
+    session_id = session_data.get("_id")
+    participant_ids = session_data.get("participantsId", [])
 
+    try:
         # --- 3. ANALYSIS ---
         print("Step 2: Running AI Analysis...")
         # analyze_video returns results including pdf_reports mapping
-        results = analyze_video(video_path, session_id, participant_ids)
+        results = analyze_video(
+            video_path,
+            session_id,
+            participant_ids,
+            progress_callback=progress_callback
+        )
         
         if results["status"] == "FAILED":
             print("Analysis failed:")
             for error in results.get('errors', []):
                 print(f"  - {error['code']}: {error['message']}")
-            return
+            return False
 
-        # --- 4. UPLOAD REPORTS (POST /uploadReport) ---
+        # --- 4. UPLOAD REPORTS (POST /uploadReport, in parallel) ---
         print("Step 3: Uploading PDF Reports to get Links...")
-        final_results_payload = []
-        
-        # pdf_reports is { "ParticipantID": "Full/Path/To/PDF" }
-        for p_id, pdf_path in results.get("pdf_reports", {}).items():
-            if os.path.exists(pdf_path):
-                print(f"  Uploading report for participant: {p_id}")
-                
-                # Open as binary to send as BLOB via multipart/form-data
-                with open(pdf_path, "rb") as f:
-                    upload_data = {"participantId": p_id}
-                    upload_files = {"Report": f} # Key must be 'Report'
-                    
-                    up_resp = requests.post(
-                        f"{API_BASE_URL}/proctoringTool/uploadReport",
-                        headers=HEADERS,
-                        data=upload_data,
-                        files=upload_files
-                    )
-                
-                if up_resp.status_code in [200, 201]:
-                    # Extract the reportLink from the upload response
-                    report_link = up_resp.json().get("reportLink")
-                    
-                    # Get status from analysis results
-                    p_status = results["participants"][p_id]["overall_status"]
-                    
-                    # Store data for the final payload
-                    final_results_payload.append({
-                        "participantId": p_id,
-                        "reportLink": report_link,
-                        "status": p_status
-                    })
-                    print(f"  Successfully got link: {report_link}")
-                else:
-                    print(f"  Failed to upload report for {p_id}: {up_resp.text}")
-
-        # --- 5. PRINT FINAL PAYLOAD (FOR VERIFICATION) ---
-        # This matches the structure required for /yog/proctoringResult
-        final_body = {
-            "sessionId": session_id,
-            "results": final_results_payload
-        }
-
-        print("\n" + "="*50)
-        print("DEBUG: PREPARED PAYLOAD FOR /yog/proctoringResult")
-        print("="*50)
-        print(json.dumps(final_body, indent=4))
-        print("="*50 + "\n")
+        uploader = ReportUploader(API_BASE_URL, AUTH_TOKEN)
+
+        try:
+            # pdf_reports is { "ParticipantID": "Full/Path/To/PDF" }
+            links, upload_errors = uploader.upload_reports(results.get("pdf_reports", {}))
+
+            # A partial result would drop the failed participants for good
+            if upload_errors:
+                for p_id, error in upload_errors.items():
+                    print(f"  Failed to upload report for {p_id}: {error}")
+                print(f"Result for {session_id} not submitted: "
+                      f"{len(upload_errors)} report upload(s) failed")
+                return False
+
+            final_results_payload = [
+                {
+                    "participantId": p_id,
+                    "reportLink": report_link,
+                    "status": results["participants"][p_id]["overall_status"]
+                }
+                for p_id, report_link in links.items()
+            ]
+
+            # --- 5. SUBMIT FINAL PAYLOAD (POST /yog/proctoringResult) ---
+            final_body = {
+                "sessionId": session_id,
+                "results": final_results_payload
+            }
+
+            print("\n" + "="*50)
+            print("PAYLOAD FOR /yog/proctoringResult")
+            print("="*50)
+            print(json.dumps(final_body, indent=4))
+            print("="*50 + "\n")
+
+            uploader.submit_results(session_id, final_results_payload)
+            print("Step 4: Proctoring result submitted.")
+            return True
+        finally:
+            uploader.close()
 
     except Exception as e:
         print(f"Unexpected Error: {e}")
         import traceback
         traceback.print_exc()
+        return False
     
     finally:
         if video_path and os.path.exists(video_path):
@@ -144,8 +176,13 @@ def get_job_and_process():
             queued_jobs = [s for s in sessions if s.get("status") == "queued"]
             
             if queued_jobs:
-                print(f"Found {len(queued_jobs)} job(s). Starting first job...")
-                process_session(queued_jobs[0])
+                print(f"Found {len(queued_jobs)} job(s). Processing with prefetch...")
+                run_with_prefetch(
+                    queued_jobs,
+                    ingest_fn=lambda job: ingest_session(job, allow_stream=False),
+                    analyze_fn=analyze_and_report,
+                    base_dir=VIDEO_BASE_DIR
+                )
             else:
                 print("No queued jobs found.")
         else:
@@ -0,0 +1,181 @@
+import shutil
+import threading
+from concurrent.futures import Future
+
+
+class Prefetcher:
+    """
+    Downloads upcoming sessions in the background while the current ones
+    are analyzed.
+
+    At most max_prefetched videos are downloading or waiting on disk, and
+    no new download starts while free space under base_dir is below
+    min_free_gb (videos of 2-3 h sessions are several GB each).
+
+    Downloads run in daemon threads, so a stopping process does not wait
+    for a multi-GB download: it is abandoned and yt-dlp resumes the .part
+    file next time.
+    """
+
+    def __init__(
+        self,
+        ingest_fn,
+        base_dir,
+        max_prefetched=2,
+        min_free_gb=20,
+        max_parallel_downloads=1
+    ):
+        """
+        ingest_fn(session_data) -> local video path or None
+        """
+        self.ingest_fn = ingest_fn
+        self.base_dir = base_dir
+        self.max_prefetched = max_prefetched
+        self.min_free_bytes = min_free_gb * 1024 ** 3
+
+        self._slots = threading.Semaphore(max_parallel_downloads)
+        self._lock = threading.Lock()
+        self._pending = {}      # job_id -> (session_data, Future)
+        self._downloads = []    # (Thread, Future) of unfinished downloads
+
+    # -------------------------------
+    # Capacity
+    # -------------------------------
+    def disk_ok(self):
+        return shutil.disk_usage(self.base_dir).free >= self.min_free_bytes
+
+    def has_room(self):
+        with self._lock:
+            if len(self._pending) >= self.max_prefetched:
+                return False
+        return self.disk_ok()
+
+    def __contains__(self, job_id):
+        with self._lock:
+            return job_id in self._pending
+
+    def job_ids(self):
+        with self._lock:
+            return list(self._pending)
+
+    # -------------------------------
+    # Public
+    # -------------------------------
+    def offer(self, session_data):
+        """
+        Starts downloading session_data if there is room.
+        Returns True if accepted.
+        """
+        job_id = session_data.get("_id")
+        if job_id in self or not self.has_room():
+            return False
+
+        future = Future()
+        thread = threading.Thread(target=self._download, args=(session_data, future), daemon=True)
+        with self._lock:
+            self._pending[job_id] = (session_data, future)
+            self._downloads = [d for d in self._downloads if not d[1].done()]
+            self._downloads.append((thread, future))
+        thread.start()
+        return True
+
+    def _download(self, session_data, future):
+        with self._slots:
+            # Cancelled by shutdown() while waiting for a slot
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self.ingest_fn(session_data))
+            except Exception as e:
+                print(f"❌ Prefetch failed for {session_data.get('_id')}: {e}")
+                future.set_result(None)
+
+    def ready(self):
+        """
+        Finished downloads in offer order: [(session_data, video_path or None), ...]
+        They keep counting against max_prefetched until take()n.
+        """
+        with self._lock:
+            return [
+                (session_data, future.result())
+                for session_data, future in self._pending.values()
+                if future.done() and not future.cancelled()
+            ]
+
+    def take(self, job_id):
+        """
+        Hands a finished download over to the caller (frees its slot)
+        """
+        with self._lock:
+            self._pending.pop(job_id, None)
+
+    def next_ready(self, timeout=None):
+        """
+        Blocks until the oldest pending download finishes.
+        Returns (session_data, video_path or None), or None if nothing is pending.
+        """
+        with self._lock:
+            if not self._pending:
+                return None
+            job_id, (session_data, future) = next(iter(self._pending.items()))
+
+        video_path = future.result(timeout=timeout)
+        with self._lock:
+            self._pending.pop(job_id, None)
+        return session_data, video_path
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        """
+        cancel_futures : drop downloads still waiting for a slot
+        wait           : join running downloads (otherwise they are abandoned)
+        """
+        with self._lock:
+            downloads = list(self._downloads)
+
+        if cancel_futures:
+            for _, future in downloads:
+                future.cancel()
+
+        if wait:
+            for thread, _ in downloads:
+                thread.join()
+
+
+def run_with_prefetch(jobs, ingest_fn, analyze_fn, base_dir, max_prefetched=2, min_free_gb=20):
+    """
+    Processes jobs one after another; while one is analyzed the next
+    ones are already downloading.
+
+    analyze_fn(session_data, video_path)
+    """
+    prefetcher = Prefetcher(
+        ingest_fn,
+        base_dir,
+        max_prefetched=max_prefetched,
+        min_free_gb=min_free_gb
+    )
+    waiting = list(jobs)
+
+    def refill():
+        while waiting and prefetcher.offer(waiting[0]):
+            waiting.pop(0)
+
+    try:
+        while waiting or prefetcher.job_ids():
+            refill()
+
+            item = prefetcher.next_ready()
+            if item is None:
+                print(f"⛔ Less than {min_free_gb} GB free in {base_dir}; "
+                      f"{len(waiting)} job(s) left unprocessed")
+                break
+
+            session_data, video_path = item
+
+            # Start the next download BEFORE analyzing this one
+            refill()
+
+            if video_path:
+                analyze_fn(session_data, video_path)
+    finally:
+        prefetcher.shutdown()
@@ -0,0 +1,174 @@
+import os
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from concurrent.futures import ThreadPoolExecutor
+
+
+class UploadError(Exception):
+    pass
+
+
+class ReportUploader:
+    """
+    Uploads participant PDFs and the final proctoring result.
+
+    One pooled requests.Session for all calls, reports uploaded in parallel
+    (max_parallel), every request with a timeout, and retries with
+    exponential backoff on 5xx responses and on errors raised before the
+    request reached the server. Every call here is a POST, so a read
+    timeout is not retried: the server may already have stored it.
+    """
+
+    RETRY_STATUS = {500, 502, 503, 504}
+
+    def __init__(
+        self,
+        api_base_url,
+        auth_token,
+        max_parallel=4,
+        timeout=60,
+        retries=3,
+        backoff_sec=1.0
+    ):
+        self.api_base_url = api_base_url.rstrip("/")
+        self.max_parallel = max_parallel
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_sec = backoff_sec
+
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {auth_token}"
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_parallel)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    # -------------------------------
+    # Retry loop
+    # -------------------------------
+    def _request(self, method, path, make_kwargs):
+        """
+        make_kwargs() is called per attempt so file handles are reopened
+        """
+        url = f"{self.api_base_url}{path}"
+        last_error = None
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff_sec * 2 ** (attempt - 1))
+
+            try:
+                with make_kwargs() as kwargs:
+                    response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not _not_sent(e):
+                    raise UploadError(f"{path} failed, not retried ({e})")
+                last_error = str(e)
+                continue
+
+            if response.status_code in self.RETRY_STATUS:
+                last_error = f"HTTP {response.status_code}: {response.text}"
+                continue
+
+            if response.status_code not in (200, 201):
+                raise UploadError(f"HTTP {response.status_code}: {response.text}")
+
+            return response
+
+        raise UploadError(f"{path} failed after {self.retries + 1} attempts ({last_error})")
+
+    # -------------------------------
+    # Public
+    # -------------------------------
+    def upload_report(self, participant_id, pdf_path):
+        """
+        Returns the reportLink
+        """
+        def make_kwargs():
+            return _PdfForm(participant_id, pdf_path)
+
+        response = self._request("POST", "/proctoringTool/uploadReport", make_kwargs)
+        return response.json().get("reportLink")
+
+    def upload_reports(self, pdf_reports):
+        """
+        pdf_reports: { participant_id: pdf_path }
+        Returns ({participant_id: reportLink}, {participant_id: error message})
+        """
+        links, errors = {}, {}
+        existing = {p: path for p, path in pdf_reports.items() if os.path.exists(path)}
+
+        for p_id in set(pdf_reports) - set(existing):
+            errors[p_id] = f"PDF not found: {pdf_reports[p_id]}"
+
+        if not existing:
+            return links, errors
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            futures = {
+                p_id: pool.submit(self.upload_report, p_id, path)
+                for p_id, path in existing.items()
+            }
+            for p_id, future in futures.items():
+                try:
+                    links[p_id] = future.result()
+                except Exception as e:
+                    errors[p_id] = str(e)
+
+        return links, errors
+
+    def submit_results(self, session_id, results):
+        """
+        POST /yog/proctoringResult with every participant in one call.
+        results: [{"participantId", "reportLink", "status"}, ...]
+        """
+        body = {"sessionId": session_id, "results": results}
+        response = self._request("POST", "/yog/proctoringResult", lambda: _Json(body))
+        return response.json() if response.content else {}
+
+    def close(self):
+        self.session.close()
+
+
+def _not_sent(error):
+    """
+    True if the request failed while connecting, so the server never saw it
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class _PdfForm:
+    """
+    multipart/form-data kwargs with the PDF opened for one attempt
+    """
+
+    def __init__(self, participant_id, pdf_path):
+        self.participant_id = participant_id
+        self.pdf_path = pdf_path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.pdf_path, "rb")
+        return {
+            "data": {"participantId": self.participant_id},
+            "files": {"Report": self._file}     # Key must be 'Report'
+        }
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+class _Json:
+    def __init__(self, body):
+        self.body = body
+
+    def __enter__(self):
+        return {"json": self.body}
+
+    def __exit__(self, *exc):
+        pass
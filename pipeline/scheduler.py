@@ -0,0 +1,219 @@
+import os
+import sys
+import time
+import queue
+import signal
+import multiprocessing
+from multiprocessing.managers import SyncManager
+from concurrent.futures import ProcessPoolExecutor
+
+# Add project root for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ingestion.video_probe import probe_video
+
+def _ignore_sigint():
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _init_worker(threads):
+    """
+    Runs once in every pool process: pin math / decode thread pools so N
+    sessions do not each spawn a thread per core, then preload models.
+
+    Only runtime calls work here: torch is already imported by the time
+    this runs (main module preload), so OMP_NUM_THREADS & co. would be
+    read too late.
+    """
+    # open_decoder() reads it per call → FFmpeg decode threads per session
+    os.environ["DECODE_THREADS"] = str(threads)
+
+    # The parent handles Ctrl+C / SIGTERM and drains the pool
+    _ignore_sigint()
+
+    import cv2
+    cv2.setNumThreads(threads)
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+    from yolo.model_registry import warm_up
+    warm_up()
+
+
+def _pool_context():
+    """
+    forkserver where available (Linux), else spawn: never fork the worker
+    itself, whose prefetch threads may hold locks (yt-dlp, logging) at
+    that moment and leave them locked in the child.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _run_session(session_data, video_path, progress_queue):
+    # Reporting path: the submitted result takes the session off the queue
+    from pipeline.post_api_trial import process_session, analyze_and_report
+
+    job_id = session_data.get("_id")
+
+    def report(processed_sec, window_sec):
+        progress_queue.put((job_id, processed_sec, window_sec))
+
+    if video_path:
+        # Already downloaded (prefetched) → analysis only
+        analyze_and_report(session_data, video_path, progress_callback=report)
+    else:
+        process_session(session_data, progress_callback=report)
+    return job_id
+
+
+class SessionScheduler:
+    """
+    Runs whole sessions in a process pool, one session per process.
+
+    Jobs are admitted by estimated cost = video seconds × participants, so a
+    few long, crowded sessions do not pile onto the host at once. A job
+    bigger than the whole budget still runs, but only on an idle pool.
+    """
+
+    def __init__(
+        self,
+        max_workers=None,
+        threads_per_worker=None,
+        cost_budget=None,
+        default_duration_sec=3 * 3600,
+        default_participants=4
+    ):
+        cores = os.cpu_count() or 1
+
+        self.max_workers = max_workers or max(1, cores // 4)
+        self.threads_per_worker = threads_per_worker or max(1, cores // self.max_workers)
+        self.default_duration_sec = default_duration_sec
+        self.cost_budget = cost_budget or float(
+            os.getenv(
+                "SCHEDULER_COST_BUDGET",
+                self.max_workers * default_duration_sec * default_participants
+            )
+        )
+
+        ctx = _pool_context()
+        self._manager = SyncManager(ctx=ctx)
+        self._manager.start(_ignore_sigint)
+        self._progress_queue = self._manager.Queue()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker,)
+        )
+
+        # -------------------------
+        # State
+        # -------------------------
+        self._running = {}      # job_id -> (Future, cost)
+        self.progress = {}      # job_id -> (processed_sec, window_sec)
+        self.completed = 0
+        self.started_at = time.time()
+
+    # --------------------------------------------------
+    # Admission
+    # --------------------------------------------------
+    def estimate_cost(self, session_data, video_path=None):
+        duration = self.default_duration_sec
+        if video_path and os.path.exists(video_path):
+            duration = probe_video(video_path)["duration"] or duration
+
+        participants = max(1, len(session_data.get("participantsId", [])))
+        return duration * participants
+
+    @property
+    def running_cost(self):
+        return sum(cost for _, cost in self._running.values())
+
+    def free_slots(self):
+        return self.max_workers - len(self._running)
+
+    def can_admit(self, cost):
+        if self.free_slots() <= 0:
+            return False
+        if not self._running:
+            return True
+        return self.running_cost + cost <= self.cost_budget
+
+    def submit(self, session_data, video_path=None):
+        """
+        Returns False if the job does not fit right now
+        """
+        job_id = session_data.get("_id")
+        cost = self.estimate_cost(session_data, video_path)
+
+        if not self.can_admit(cost):
+            return False
+
+        future = self._pool.submit(
+            _run_session,
+            session_data,
+            video_path,
+            self._progress_queue
+        )
+        self._running[job_id] = (future, cost)
+        self.progress[job_id] = (0, None)
+        return True
+
+    # --------------------------------------------------
+    # Progress / completion
+    # --------------------------------------------------
+    def _drain_progress(self):
+        while True:
+            try:
+                job_id, processed_sec, window_sec = self._progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if job_id in self.progress:
+                self.progress[job_id] = (processed_sec, window_sec)
+
+    def poll(self):
+        """
+        Updates progress and returns the job ids that finished since the
+        last call (successfully or not)
+        """
+        self._drain_progress()
+
+        finished = []
+        for job_id, (future, _) in list(self._running.items()):
+            if not future.done():
+                continue
+
+            del self._running[job_id]
+            self.progress.pop(job_id, None)
+            self.completed += 1
+            finished.append(job_id)
+
+            if future.exception():
+                print(f"❌ Session {job_id} crashed: {future.exception()}")
+
+        return finished
+
+    def running_jobs(self):
+        return list(self._running)
+
+    def sessions_per_hour(self):
+        hours = (time.time() - self.started_at) / 3600
+        return self.completed / hours if hours > 0 else 0.0
+
+    def report(self):
+        for job_id, (processed_sec, window_sec) in self.progress.items():
+            if window_sec:
+                print(f"⏳ {job_id}: {100 * processed_sec / window_sec:.0f}% of analysis window")
+            else:
+                print(f"⏳ {job_id}: starting")
+        print(f"📈 Throughput: {self.sessions_per_hour():.2f} sessions/hour")
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+        self._manager.shutdown()
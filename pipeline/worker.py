@@ -0,0 +1,219 @@
+import os
+import sys
+import time
+import signal
+import threading
+
+# Add project root for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pipeline.app import fetch_queued_jobs, ingest_session, VIDEO_BASE_DIR
+from pipeline.job_lease import JobLease
+from pipeline.scheduler import SessionScheduler
+from pipeline.prefetcher import Prefetcher
+
+
+def default_max_sessions(cores_per_session=None, ram_gb_per_session=None):
+    """
+    Concurrent sessions this host can take, limited by cores and RAM.
+    WORKER_MAX_SESSIONS overrides the estimate.
+    """
+    override = os.getenv("WORKER_MAX_SESSIONS")
+    if override:
+        return max(1, int(override))
+
+    cores_per_session = cores_per_session or float(os.getenv("WORKER_CORES_PER_SESSION", 4))
+    ram_gb_per_session = ram_gb_per_session or float(os.getenv("WORKER_RAM_GB_PER_SESSION", 4))
+
+    cores = os.cpu_count() or 1
+    try:
+        ram_gb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024 ** 3
+    except (ValueError, OSError, AttributeError):
+        ram_gb = ram_gb_per_session   # unknown (e.g. Windows) → cores decide
+
+    return max(1, int(min(cores / cores_per_session, ram_gb / ram_gb_per_session)))
+
+
+class JobWorker:
+    """
+    Long-running worker: polls /proctoringTool/queuedJobs, leases jobs,
+    downloads them ahead of time (Prefetcher, at most max_prefetched on
+    disk) and hands finished downloads to a SessionScheduler (process pool,
+    up to max_sessions at once) that analyzes them and submits the
+    results. Pool processes live as long as the worker, so interpreter
+    start, torch import and model loading happen once per process.
+
+    - empty queue / API errors → exponential backoff (poll_interval → max_backoff)
+    - SIGTERM / SIGINT → stop taking jobs, finish running sessions, exit
+      (a second signal exits immediately; leases then expire on their own)
+    """
+
+    def __init__(
+        self,
+        max_sessions=None,
+        poll_interval=15,
+        max_backoff=600,
+        lease_dir=None,
+        lease_ttl_sec=4 * 3600,
+        max_prefetched=2,
+        min_free_gb=20
+    ):
+        self.max_sessions = max_sessions or default_max_sessions()
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.lease = JobLease(
+            lease_dir or os.path.join(VIDEO_BASE_DIR, ".leases"),
+            ttl_sec=lease_ttl_sec
+        )
+
+        self._stop = threading.Event()
+        self._last_renew = time.time()
+        self._last_report = time.time()
+        self.scheduler = None
+        self.prefetcher = Prefetcher(
+            lambda job: ingest_session(job, allow_stream=False),
+            VIDEO_BASE_DIR,
+            max_prefetched=max_prefetched,
+            min_free_gb=min_free_gb
+        )
+
+    # -------------------------------
+    # Signals
+    # -------------------------------
+    def request_stop(self, signum=None, frame=None):
+        if self._stop.is_set():
+            print("⛔ Second stop signal — exiting now")
+            sys.exit(1)
+
+        print("🛑 Stop requested — finishing running sessions...")
+        self._stop.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGINT, self.request_stop)
+        if hasattr(signal, "SIGTERM"):
+            signal.signal(signal.SIGTERM, self.request_stop)
+
+    # -------------------------------
+    # Job handling
+    # -------------------------------
+    def _reap(self):
+        for job_id in self.scheduler.poll():
+            self.lease.release(job_id, done=True)
+            print(f"🏁 Session {job_id} finished")
+
+        if time.time() - self._last_report >= 300:
+            self.scheduler.report()
+            self._last_report = time.time()
+
+    def _dispatch_downloads(self):
+        """
+        Moves finished downloads into the scheduler while it admits them
+        """
+        for session_data, video_path in self.prefetcher.ready():
+            job_id = session_data.get("_id")
+
+            if not video_path:
+                self.prefetcher.take(job_id)
+                self.lease.release(job_id, done=True)
+                print(f"❌ Session {job_id} could not be downloaded")
+                continue
+
+            if not self.scheduler.submit(session_data, video_path=video_path):
+                break   # busy / over the cost budget → keep it on disk
+
+            self.prefetcher.take(job_id)
+            print(f"▶ Session {job_id} started")
+
+    def _held_jobs(self):
+        return self.scheduler.running_jobs() + self.prefetcher.job_ids()
+
+    def _renew_leases(self):
+        if time.time() - self._last_renew < self.lease.ttl_sec / 3:
+            return
+        for job_id in self._held_jobs():
+            self.lease.renew(job_id)
+        self._last_renew = time.time()
+
+    def _lease_new_jobs(self):
+        """
+        Returns the number of jobs leased and queued for download
+        """
+        leased = 0
+        held = set(self._held_jobs())
+        queued = fetch_queued_jobs()
+
+        # Finished jobs the API no longer lists need no "done" marker
+        self.lease.prune_done(job.get("_id") for job in queued)
+
+        for job in queued:
+            if not self.prefetcher.has_room():
+                break
+
+            job_id = job.get("_id")
+            if not job_id or job_id in held:
+                continue
+            if not self.lease.acquire(job_id):
+                continue
+
+            if not self.prefetcher.offer(job):
+                self.lease.release(job_id, done=False)
+                break
+
+            print(f"🔔 Leased session {job_id}, downloading")
+            leased += 1
+
+        return leased
+
+    # -------------------------------
+    # Main loop
+    # -------------------------------
+    def run_forever(self, tick=5):
+        print(f"👷 Worker started (max {self.max_sessions} concurrent session(s))")
+        self.scheduler = SessionScheduler(max_workers=self.max_sessions)
+
+        backoff = self.poll_interval
+        next_poll = 0
+
+        while not self._stop.is_set():
+            self._reap()
+            self._dispatch_downloads()
+            self._renew_leases()
+
+            if time.time() >= next_poll and self.prefetcher.has_room():
+                try:
+                    leased = self._lease_new_jobs()
+                except Exception as e:
+                    print(f"❌ Polling failed: {e}")
+                    leased = 0
+
+                if leased:
+                    backoff = self.poll_interval
+                    next_poll = time.time() + self.poll_interval
+                else:
+                    print(f"ℹ️ Nothing to lease, next poll in {backoff}s")
+                    next_poll = time.time() + backoff
+                    backoff = min(backoff * 2, self.max_backoff)
+
+            self._stop.wait(tick)
+
+        # Downloads that never started analysis go back to the queue at
+        # once; running ones are abandoned, not awaited (yt-dlp resumes them)
+        for job_id in self.prefetcher.job_ids():
+            self.prefetcher.take(job_id)
+            self.lease.release(job_id, done=False)
+        self.prefetcher.shutdown(wait=False, cancel_futures=True)
+
+        print(f"⏳ Waiting for {len(self.scheduler.running_jobs())} running session(s)...")
+        while self.scheduler.running_jobs():
+            self._reap()
+            self._renew_leases()
+            time.sleep(1)
+
+        self.scheduler.shutdown()
+        print("👋 Worker stopped")
+
+
+if __name__ == "__main__":
+    worker = JobWorker()
+    worker.install_signal_handlers()
+    worker.run_forever()
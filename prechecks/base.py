@@ -1,14 +1,63 @@
+import threading
+import cv2
 from abc import ABC, abstractmethod
+from ingestion.decoder import open_decoder
 
 class PrecheckResult:
-    def __init__(self, ok: bool, error_code=None, message=None):
+    def __init__(self, ok: bool, error_code=None, message=None, cancelled=False):
         self.ok = ok
         self.error_code = error_code
         self.message = message
+        self.cancelled = cancelled
+
+
+class CancellationToken:
+    """
+    Set once a blocking precheck fails; long-running checks poll it and stop
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
 
 
 class BasePrecheck(ABC):
 
+    # A failed blocking check cancels the remaining in-flight checks
+    blocking = True
+
     @abstractmethod
-    def run(self, video_path) -> PrecheckResult:
+    def run(self, video_path, window=None) -> PrecheckResult:
+        """
+        window: optional (start_sec, end_sec) analysis window from the
+                audio markers. Frame-sampling checks look inside it
+                instead of at frame 0.
+        """
         pass
+
+    def evaluate(self, ctx) -> PrecheckResult:
+        """
+        Runs the check against a shared VideoContext (one open, one decode
+        for all checks). Checks that read frames override this; the default
+        falls back to run().
+        """
+        return self.run(ctx.video_path, window=ctx.window)
+
+
+def open_at_window(video_path, window=None):
+    """
+    Opens the video and seeks to the start of the analysis window (if any)
+    """
+    cap = open_decoder(video_path)
+
+    if window is not None and cap.isOpened():
+        start_sec, _ = window
+        cap.set(cv2.CAP_PROP_POS_MSEC, max(start_sec, 0) * 1000.0)
+
+    return cap
@@ -1,45 +1,105 @@
 import cv2
 import numpy as np
-from prechecks.base import BasePrecheck, PrecheckResult
+from prechecks.base import PrecheckResult
+from prechecks.video_context import ContextPrecheck
 
-class FreezeCheck(BasePrecheck):
+class FreezeCheck(ContextPrecheck):
+    """
+    Probes K evenly spaced points across the analysis window (or the whole
+    video), decodes a short burst at each and compares small grayscale
+    pixel samples. Covers the full session with K * burst_frames decodes.
+
+    Samples are nearest-neighbour (no averaging), so the sensor noise of a
+    live camera on a still room keeps its frames apart; a frozen picture
+    repeats exactly. Two static probes showing the same picture are only a
+    suspicion: the time between them counts as frozen once single frames
+    every confirm_step_sec in between show that picture too.
+    """
 
     def __init__(
         self,
-        sample_frames=60,
+        probes=12,
+        burst_frames=5,
         diff_thresh=1.0,
-        identical_ratio_thresh=1.0
+        identical_ratio_thresh=1.0,
+        max_frozen_seconds=15 * 60,
+        thumb_width=160,
+        confirm_step_sec=60
     ):
-        self.sample_frames = sample_frames
+        self.probes = probes
+        self.burst_frames = burst_frames
         self.diff_thresh = diff_thresh
         self.identical_ratio_thresh = identical_ratio_thresh
+        self.max_frozen_seconds = max_frozen_seconds
+        self.thumb_width = thumb_width
+        self.confirm_step_sec = confirm_step_sec
+
+    def _same(self, a, b):
+        if a.shape != b.shape:
+            return False
+        return np.mean(cv2.absdiff(a, b)) < self.diff_thresh
+
+    def _sample(self, ctx, at_sec, count):
+        return ctx.burst(at_sec, count, self.thumb_width, sharp=True)
 
-    def run(self, video_path):
-        cap = cv2.VideoCapture(video_path)
+    def _confirmed(self, ctx, from_sec, to_sec, reference):
+        """
+        True if a frame every confirm_step_sec in (from_sec, to_sec) shows
+        the reference picture
+        """
+        t = from_sec + self.confirm_step_sec
+        while t < to_sec:
+            if ctx.cancelled:
+                return False
+            frames = self._sample(ctx, t, 1)
+            if not frames or not self._same(reference, frames[0]):
+                return False
+            t += self.confirm_step_sec
+        return True
+
+    def evaluate(self, ctx):
+        start_sec, end_sec = ctx.span()
+        spacing = max(end_sec - start_sec, 0) / max(self.probes, 1)
 
-        prev_gray = None
         identical_frames = 0
         total = 0
 
-        for _ in range(self.sample_frames):
-            ret, frame = cap.read()
-            if not ret:
-                break
+        # Consecutive probes that are static AND show the same picture,
+        # confirmed in between
+        frozen_run_sec = 0.0
+        longest_frozen_sec = 0.0
+        prev_burst = None
+        prev_sec = None
 
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        for i in range(self.probes):
+            if ctx.cancelled:
+                return PrecheckResult(False, cancelled=True)
 
-            if prev_gray is not None:
-                diff = np.mean(np.abs(gray.astype(np.float32) - prev_gray))
+            at_sec = start_sec + (i + 0.5) * spacing
+            burst = self._sample(ctx, at_sec, self.burst_frames)
 
+            static = len(burst) > 1
+            for prev_gray, gray in zip(burst, burst[1:]):
                 # STRICT identical check (not just low motion)
-                if diff < self.diff_thresh:
+                if self._same(prev_gray, gray):
                     identical_frames += 1
-
+                else:
+                    static = False
                 total += 1
 
-            prev_gray = gray
+            if (
+                static
+                and prev_burst
+                and self._same(prev_burst[-1], burst[0])
+                and self._confirmed(ctx, prev_sec, at_sec, prev_burst[-1])
+            ):
+                frozen_run_sec += at_sec - prev_sec
+            else:
+                frozen_run_sec = 0.0
 
-        cap.release()
+            longest_frozen_sec = max(longest_frozen_sec, frozen_run_sec)
+            prev_burst = burst if static else None
+            prev_sec = at_sec
 
         if total == 0:
             return PrecheckResult(
@@ -58,4 +118,11 @@ class FreezeCheck(BasePrecheck):
                 f"Frames repeated too often ({identical_ratio:.2f})"
             )
 
+        if longest_frozen_sec >= self.max_frozen_seconds:
+            return PrecheckResult(
+                False,
+                "VIDEO_DISCONTINUITY",
+                f"Video frozen for about {longest_frozen_sec:.0f}s"
+            )
+
         return PrecheckResult(True)
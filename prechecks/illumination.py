@@ -1,23 +1,19 @@
-import cv2
 import numpy as np
-from prechecks.base import BasePrecheck, PrecheckResult
+from prechecks.base import PrecheckResult
+from prechecks.video_context import ContextPrecheck
 
-class IlluminationCheck(BasePrecheck):
+class IlluminationCheck(ContextPrecheck):
 
     def __init__(self, min_brightness=40):
         self.min_brightness = min_brightness
 
-    def run(self, video_path):
-        cap = cv2.VideoCapture(video_path)
+    def evaluate(self, ctx):
+        frames = ctx.gray_frames(1)
 
-        ret, frame = cap.read()
-        cap.release()
-
-        if not ret:
+        if not frames:
             return PrecheckResult(False, "FRAME_READ_FAIL", "Cannot read frame")
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        brightness = np.mean(gray)
+        brightness = np.mean(frames[0])
 
         if brightness < self.min_brightness:
             return PrecheckResult(
@@ -1,23 +1,45 @@
-from prechecks.base import BasePrecheck, PrecheckResult
-from ultralytics import YOLO
-import cv2
+from prechecks.base import PrecheckResult
+from prechecks.video_context import ContextPrecheck
+from yolo.model_registry import get_pose_detector
 
-class ParticipantCheck(BasePrecheck):
+class ParticipantCheck(ContextPrecheck):
+    """
+    Counts people on a few frames spread inside the analysis window, using
+    the pipeline's pose model from the registry (no second model load).
+    """
 
-    def __init__(self, min_people=1):
-        self.model = YOLO("yolov8n.pt")
+    def __init__(self, min_people=1, samples=3, detector=None):
         self.min_people = min_people
+        self.samples = samples
+        self.detector = detector
 
-    def run(self, video_path):
-        cap = cv2.VideoCapture(video_path)
-        ret, frame = cap.read()
-        cap.release()
+    def evaluate(self, ctx):
+        if self.detector is None:
+            self.detector = get_pose_detector("yolov8n-pose.pt", conf=0.6, imgsz=640)
 
-        if not ret:
-            return PrecheckResult(False, "FRAME_READ_FAIL", "Cannot read frame")
+        start_sec, end_sec = ctx.span()
+        step = max(end_sec - start_sec, 0) / (self.samples + 1)
+
+        people = 0
+        read_any = False
+
+        for i in range(1, self.samples + 1):
+            if ctx.cancelled:
+                return PrecheckResult(False, cancelled=True)
 
-        results = self.model(frame)[0]
-        people = sum(int(box.cls[0] == 0) for box in results.boxes)
+            # Presence does not need the exact frame → nearest keyframe
+            frame = ctx.keyframe_at(start_sec + i * step)
+            if frame is None:
+                continue
+            read_any = True
+
+            # Participants may not be seated in every sample → best frame wins
+            people = max(people, len(self.detector.detect(frame)))
+            if people >= self.min_people:
+                break
+
+        if not read_any:
+            return PrecheckResult(False, "FRAME_READ_FAIL", "Cannot read frame")
 
         if people < self.min_people:
             return PrecheckResult(
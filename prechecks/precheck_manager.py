@@ -1,17 +1,64 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from reporting.error_mapper import map_error
+from prechecks.video_context import VideoContext
 
 class PrecheckManager:
 
-    def __init__(self, checks):
+    def __init__(self, checks, max_workers=4, collect_all=False):
+        """
+        max_workers : checks run concurrently in a thread pool
+        collect_all : True  → run every check, return the full error list
+                      False → first blocking failure cancels in-flight checks
+        """
         self.checks = checks
+        self.max_workers = max_workers
+        self.collect_all = collect_all
+        self._lock = threading.Lock()
 
-    def run_all(self, video_path):
-        errors = []
+    def _run_check(self, check, ctx):
+        if ctx.cancelled:
+            return None
 
-        for check in self.checks:
-            result = check.run(video_path)
-            if not result.ok:
-                errors.append(map_error(result.error_code))
+        result = check.evaluate(ctx)
+
+        with self._lock:
+            # Anything finishing after cancellation may have seen cut-short data
+            if ctx.cancelled or result.cancelled:
+                return None
+
+            if not result.ok and check.blocking and not self.collect_all:
+                ctx.cancel_token.cancel()
+
+        return result
+
+    def run_all(self, video_path, window=None):
+        """
+        window: optional (start_sec, end_sec) from the audio markers
+
+        The container is opened and the leading frames decoded ONCE; every
+        check reads the shared VideoContext.
+        """
+        ctx = VideoContext(video_path, window)
+        results = [None] * len(self.checks)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    pool.submit(self._run_check, check, ctx): i
+                    for i, check in enumerate(self.checks)
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        finally:
+            ctx.close()
+
+        # Errors keep the order of self.checks
+        errors = [
+            map_error(result.error_code)
+            for result in results
+            if result is not None and not result.ok
+        ]
 
         return {
             "passed": len(errors) == 0,
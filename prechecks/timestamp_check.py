@@ -7,7 +7,7 @@ class TimestampCheck(BasePrecheck):
     def __init__(self, required_year=2026):
         self.required_year = required_year
 
-    def run(self, video_path):
+    def run(self, video_path, window=None):
         try:
             modified = os.path.getmtime(video_path)
         except Exception:
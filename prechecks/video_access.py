@@ -1,20 +1,14 @@
-import cv2
-import os
-from prechecks.base import BasePrecheck, PrecheckResult
+from prechecks.base import PrecheckResult
+from prechecks.video_context import ContextPrecheck
 
-class VideoAccessCheck(BasePrecheck):
+class VideoAccessCheck(ContextPrecheck):
 
-    def run(self, video_path):
-        if os.path.exists(video_path):
-            PrecheckResult(ok=True)  # 🔑 skip link logic entirely
-        cap = cv2.VideoCapture(video_path)
-
-        if not cap.isOpened():
+    def evaluate(self, ctx):
+        if not ctx.opened:
             return PrecheckResult(
                 ok=False,
                 error_code="VIDEO_NOT_ACCESSIBLE",
                 message="Video file/link could not be opened"
             )
 
-        cap.release()
         return PrecheckResult(ok=True)
@@ -0,0 +1,223 @@
+import threading
+import cv2
+from abc import abstractmethod
+from prechecks.base import BasePrecheck, PrecheckResult, CancellationToken, open_at_window
+from ingestion.video_probe import probe_video
+from utils.frame_thumbnail import gray_sample
+from ingestion.decoder import open_decoder, pyav_available, warn_keyframe_fallback
+
+
+class VideoContext:
+    """
+    Opened once per precheck run and shared by every check.
+
+    - metadata : VideoProbe result (ffprobe, cached per file)
+    - frames   : consecutive frames from the window start, decoded once on
+                 first use. Colour is kept only for the first keep_color
+                 frames, every frame also gets a downsampled grayscale copy.
+    - burst()  : a few consecutive thumbnails after a seek, for probes
+                 spread across the window (sharp=True: unaveraged pixel
+                 samples that keep sensor noise, for freeze checks)
+    - keyframe_at() : approximate frame for sparse probes, decoding one
+                 I-frame only (PyAV skip_frame="NONKEY")
+    - cancel_token : decoding stops early once it is cancelled
+
+    Safe to share between checks running in different threads.
+    """
+
+    def __init__(self, video_path, window=None, keep_color=3, thumb_width=320):
+        self.video_path = video_path
+        self.window = window
+        self.keep_color = keep_color
+        self.thumb_width = thumb_width
+        self.cancel_token = CancellationToken()
+
+        self._lock = threading.RLock()
+        self._color = []
+        self._gray = []
+        self._bursts = {}
+        self._exhausted = False
+        self._seeked = False
+        self._key_decoder = None
+
+        self.cap = open_at_window(video_path, window)
+        self.opened = self.cap.isOpened()
+        self._seq_start_msec = self.cap.get(cv2.CAP_PROP_POS_MSEC) if self.opened else 0
+
+        self.metadata = probe_video(video_path)
+
+    # --------------------------------------------------
+    def _thumbnail(self, frame, width=None):
+        width = width or self.thumb_width
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        h, w = gray.shape
+        if w <= width:
+            return gray
+        size = (width, max(1, int(h * width / w)))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+    def span(self):
+        """
+        (start_sec, end_sec) to sample from: the audio window or whole video
+        """
+        if self.window is not None:
+            start_sec, end_sec = self.window
+            return max(start_sec, 0), min(end_sec, self.metadata["duration"] or end_sec)
+        return 0.0, self.metadata["duration"]
+
+    @property
+    def cancelled(self):
+        return self.cancel_token.cancelled
+
+    def _decode_until(self, count):
+        # Lock per frame so a check needing 1 frame is not stuck behind a
+        # check decoding 900
+        while not self.cancelled:
+            with self._lock:
+                if len(self._gray) >= count or self._exhausted or not self.opened:
+                    return
+
+                if self._seeked:
+                    # A burst moved the read position; continue the sequence
+                    fps = self.metadata["fps"] or 25
+                    pos = self._seq_start_msec + len(self._gray) * 1000.0 / fps
+                    self.cap.set(cv2.CAP_PROP_POS_MSEC, pos)
+                    self._seeked = False
+
+                ret, frame = self.cap.read()
+                if not ret:
+                    self._exhausted = True
+                    return
+
+                if len(self._color) < self.keep_color:
+                    self._color.append(frame)
+                self._gray.append(self._thumbnail(frame))
+
+    # --------------------------------------------------
+    def color_frames(self, count=1):
+        """
+        First `count` BGR frames of the window (count <= keep_color)
+        """
+        count = min(count, self.keep_color)
+        self._decode_until(count)
+        return self._color[:count]
+
+    def gray_frames(self, count):
+        """
+        First `count` downsampled grayscale frames of the window
+        """
+        self._decode_until(count)
+        return self._gray[:count]
+
+    def color_at(self, at_sec):
+        """
+        One full-resolution BGR frame at at_sec (absolute video seconds),
+        cached. None if it cannot be read.
+        """
+        key = ("color", round(at_sec, 3))
+
+        with self._lock:
+            if key in self._bursts:
+                return self._bursts[key]
+
+            frame = None
+            if self.opened and self.cap is not None and not self.cancelled:
+                self.cap.set(cv2.CAP_PROP_POS_MSEC, at_sec * 1000.0)
+                self._seeked = True
+                ret, frame = self.cap.read()
+                frame = frame if ret else None
+
+            self._bursts[key] = frame
+            return frame
+
+    def burst(self, at_sec, count, thumb_width=160, sharp=False):
+        """
+        `count` consecutive downsampled grayscale frames starting at at_sec
+        (absolute video seconds). Cached, so checks probing the same points
+        decode them once.
+        sharp: nearest-neighbour samples (gray_sample) instead of area-
+               averaged thumbnails
+        """
+        key = (round(at_sec, 3), count, thumb_width, sharp)
+
+        with self._lock:
+            if key in self._bursts:
+                return self._bursts[key]
+
+            frames = []
+            if self.opened and self.cap is not None and not self.cancelled:
+                self.cap.set(cv2.CAP_PROP_POS_MSEC, at_sec * 1000.0)
+                self._seeked = True
+
+                for _ in range(count):
+                    ret, frame = self.cap.read()
+                    if not ret:
+                        break
+                    frames.append(
+                        gray_sample(frame, thumb_width) if sharp
+                        else self._thumbnail(frame, thumb_width)
+                    )
+
+            self._bursts[key] = frames
+            return frames
+
+    def keyframe_at(self, at_sec):
+        """
+        BGR keyframe at or just before at_sec (absolute video seconds):
+        a seek plus one I-frame decode, no decoding forward to at_sec.
+        Falls back to color_at() without PyAV.
+        """
+        if not pyav_available():
+            warn_keyframe_fallback("VideoContext.keyframe_at")
+            return self.color_at(at_sec)
+
+        key = ("key", round(at_sec, 3))
+
+        with self._lock:
+            if key in self._bursts:
+                return self._bursts[key]
+
+            frame = None
+            if self.opened and not self.cancelled:
+                if self._key_decoder is None:
+                    self._key_decoder = open_decoder(
+                        self.video_path, backend="pyav", keyframes_only=True
+                    )
+                self._key_decoder.set(cv2.CAP_PROP_POS_MSEC, at_sec * 1000.0)
+                ret, frame = self._key_decoder.read()
+                frame = frame if ret else None
+
+            self._bursts[key] = frame
+            return frame
+
+    # --------------------------------------------------
+    def close(self):
+        with self._lock:
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
+            if self._key_decoder is not None:
+                self._key_decoder.release()
+                self._key_decoder = None
+            self._exhausted = True
+            self._color = []
+            self._gray = []
+            self._bursts = {}
+
+
+class ContextPrecheck(BasePrecheck):
+    """
+    Base for checks that read frames. run() opens a private VideoContext;
+    PrecheckManager calls evaluate() with the shared one instead.
+    """
+
+    def run(self, video_path, window=None):
+        ctx = VideoContext(video_path, window)
+        try:
+            return self.evaluate(ctx)
+        finally:
+            ctx.close()
+
+    @abstractmethod
+    def evaluate(self, ctx) -> PrecheckResult:
+        pass
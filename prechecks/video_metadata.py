@@ -1,23 +1,17 @@
-import cv2
-from prechecks.base import BasePrecheck, PrecheckResult
+from prechecks.base import PrecheckResult
+from prechecks.video_context import ContextPrecheck
 from datetime import datetime
 import json
 
 
-class VideoMetadataCheck(BasePrecheck):
+class VideoMetadataCheck(ContextPrecheck):
 
     def __init__(self, min_duration_sec=2.5 * 3600):
         self.min_duration_sec = min_duration_sec
 
 
-    def run(self, video_path):
-        cap = cv2.VideoCapture(video_path)
-
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        duration = frames / max(fps, 1)
-
-        cap.release()
+    def evaluate(self, ctx):
+        duration = ctx.metadata["duration"]
 
         if duration < self.min_duration_sec:
             return PrecheckResult(
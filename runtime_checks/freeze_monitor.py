@@ -1,50 +1,106 @@
 import cv2
-import hashlib
-from collections import defaultdict
+import numpy as np
+from utils.frame_thumbnail import gray_thumbnail, gray_sample
 
 
 class RuntimeFreezeMonitor:
-    def __init__(self, freeze_seconds=15 * 60, fps=1):
+    def __init__(
+        self,
+        freeze_seconds=15 * 60,
+        fps=1,
+        hash_size=16,
+        max_hamming=10,
+        max_residual=1.0,
+        sample_width=160
+    ):
         """
         freeze_seconds : allowed freeze duration (default 15 min)
-        fps            : processing fps (your pipeline = 1 FPS)
+        fps            : only used when update() gets no timestamp
+        hash_size      : dHash grid (hash_size x hash_size bits)
+        max_hamming    : bits that may differ and still count as the same
+                         picture (absorbs compression noise)
+        max_residual   : mean absolute pixel difference (nearest-neighbour
+                         sample, see gray_sample) allowed on top of the hash
+                         match. A live camera on a still room keeps its
+                         sensor noise above it; a repeated picture does not.
+        sample_width   : width of that pixel sample
+
+        Fed with the already-sampled frames (or their thumbnails); freeze
+        time is measured in seconds, so the sampling rate does not matter.
         """
-        self.max_same_frames = freeze_seconds * fps
-        self.last_hash = None
-        self.same_counter = 0
+        self.freeze_seconds = freeze_seconds
+        self.frame_dt = 1.0 / fps
+        self.hash_size = hash_size
+        self.max_hamming = max_hamming
+        self.max_residual = max_residual
+        self.sample_width = sample_width
+
+        self.anchor_hash = None
+        self.anchor_sample = None
+        self.frozen_since = None
+        self.last_ts = None
 
-    def _frame_hash(self, frame):
+    def _frame_hash(self, thumb):
         """
-        Robust perceptual hash using resized grayscale frame
+        Difference hash: sign of horizontal gradients on a tiny grid
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        small = cv2.resize(gray, (64, 64))
-        return hashlib.md5(small.tobytes()).hexdigest()
+        small = cv2.resize(
+            thumb,
+            (self.hash_size + 1, self.hash_size),
+            interpolation=cv2.INTER_AREA
+        )
+        return np.packbits(small[:, 1:] > small[:, :-1])
+
+    @staticmethod
+    def _hamming(a, b):
+        return int(np.unpackbits(np.bitwise_xor(a, b)).sum())
+
+    def _same_pixels(self, sample):
+        if self.anchor_sample is None or sample.shape != self.anchor_sample.shape:
+            return False
+        return np.mean(cv2.absdiff(sample, self.anchor_sample)) <= self.max_residual
 
-    def update(self, frame):
+    def update(self, frame=None, timestamp=None, thumb=None):
         """
+        frame     : BGR frame (pixel residual; thumbnail if thumb is None)
+        timestamp : seconds of this sample; defaults to 1/fps steps
+        thumb     : grayscale thumbnail already computed by the caller.
+                    Without a frame the residual is taken on it, where
+                    averaging has hidden most sensor noise.
+
         Returns:
         - None → OK
         - dict → FREEZE ERROR
         """
-        curr_hash = self._frame_hash(frame)
+        if timestamp is None:
+            timestamp = 0.0 if self.last_ts is None else self.last_ts + self.frame_dt
+        self.last_ts = timestamp
+
+        if thumb is None:
+            thumb = gray_thumbnail(frame)
+
+        sample = gray_sample(frame, self.sample_width) if frame is not None else thumb
+        curr_hash = self._frame_hash(thumb)
 
-        if self.last_hash is None:
-            self.last_hash = curr_hash
+        if (
+            self.anchor_hash is None
+            or self._hamming(curr_hash, self.anchor_hash) > self.max_hamming
+            or not self._same_pixels(sample)
+        ):
+            # New picture (or a live still scene) → restart the run
+            self.anchor_hash = curr_hash
+            self.anchor_sample = sample
+            self.frozen_since = timestamp
             return None
 
-        if curr_hash == self.last_hash:
-            self.same_counter += 1
-        else:
-            self.same_counter = 0
-            self.last_hash = curr_hash
+        frozen_for = timestamp - self.frozen_since
 
-        if self.same_counter >= self.max_same_frames:
+        if frozen_for >= self.freeze_seconds:
             return {
                 "code": "VIDEO_DISCONTINUITY",
                 "message": (
                     f"Video frozen for more than "
-                    f"{self.max_same_frames} seconds"
+                    f"{self.freeze_seconds} seconds"
                 )
             }
 
@@ -0,0 +1,96 @@
+import numpy as np
+
+
+class RuntimeIlluminationMonitor:
+    def __init__(
+        self,
+        black_brightness=10,
+        dark_brightness=40,
+        min_contrast=6.0,
+        black_seconds=15 * 60,
+        dark_seconds=15 * 60
+    ):
+        """
+        black_brightness : mean gray below this (and flat) → black screen
+        dark_brightness  : mean gray below this → too dark to analyse
+        min_contrast     : gray std below this → flat / washed-out frame
+        black_seconds    : black longer than this → VIDEO_DISCONTINUITY
+        dark_seconds     : unusable longer than this → POOR_VIDEO_QUALITY
+
+        Fed with the grayscale thumbnails of the sampled frames.
+        """
+        self.black_brightness = black_brightness
+        self.dark_brightness = dark_brightness
+        self.min_contrast = min_contrast
+        self.black_seconds = black_seconds
+        self.dark_seconds = dark_seconds
+
+        self.segments = []
+        self.current_kind = "ok"
+        self.segment_start = None
+        self.last_ts = None
+
+    def _classify(self, thumb):
+        brightness = float(np.mean(thumb))
+        contrast = float(np.std(thumb))
+
+        if brightness < self.black_brightness and contrast < self.min_contrast:
+            return "black"
+        if brightness < self.dark_brightness or contrast < self.min_contrast:
+            return "dark"
+        return "ok"
+
+    def _close_segment(self, end_sec):
+        if self.current_kind != "ok" and self.segment_start is not None:
+            self.segments.append({
+                "kind": self.current_kind,
+                "start": self.segment_start,
+                "end": end_sec
+            })
+
+    def update(self, thumb, timestamp):
+        """
+        Returns:
+        - (usable, None)  → usable=False means skip pose inference
+        - (False, dict)   → ILLUMINATION ERROR
+        """
+        kind = self._classify(thumb)
+
+        if kind != self.current_kind:
+            self._close_segment(timestamp)
+            self.current_kind = kind
+            self.segment_start = timestamp
+
+        self.last_ts = timestamp
+
+        if kind == "ok":
+            return True, None
+
+        duration = timestamp - self.segment_start
+
+        if kind == "black" and duration >= self.black_seconds:
+            return False, {
+                "code": "VIDEO_DISCONTINUITY",
+                "message": f"Black screen for more than {self.black_seconds} seconds"
+            }
+
+        if duration >= self.dark_seconds:
+            return False, {
+                "code": "POOR_VIDEO_QUALITY",
+                "message": f"Low illumination for more than {self.dark_seconds} seconds"
+            }
+
+        return False, None
+
+    def get_segments(self):
+        """
+        Black / dark segments in seconds since ANALYSIS WINDOW START
+        """
+        segments = list(self.segments)
+        if self.current_kind != "ok" and self.segment_start is not None:
+            segments.append({
+                "kind": self.current_kind,
+                "start": self.segment_start,
+                "end": self.last_ts
+            })
+        return segments
@@ -0,0 +1,166 @@
+import sys
+import os
+import tempfile
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+# --------------------------------------------------
+# Add project root
+# --------------------------------------------------
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pipeline.analyze_video as av_module
+from pipeline.analyze_video import analyze_video
+from pipeline.checkpoint import Checkpointer
+from movement.movement_manager import MovementManager
+from yolo.inference import PoseDetection
+from test_time_based_hold import keypoints_at
+
+FPS = 5
+DURATION_SEC = 130
+WINDOW = (5.0, 125.0)
+SPIKES = [12.0, 95.0]
+BITS = 10
+BLOCK = 32
+
+
+# --------------------------------------------------
+# Synthetic session video: frame index drawn as black / white blocks
+# --------------------------------------------------
+def write_video(path):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), FPS, (640, 480))
+    rng = np.random.default_rng(0)
+    for i in range(DURATION_SEC * FPS):
+        frame = rng.integers(100, 156, (480, 640, 3), dtype=np.uint8)
+        for b in range(BITS):
+            value = 255 if (i >> b) & 1 else 0
+            frame[:BLOCK, b * BLOCK:(b + 1) * BLOCK] = value
+        writer.write(frame)
+    writer.release()
+
+
+def frame_index(frame):
+    i = 0
+    for b in range(BITS):
+        block = frame[8:BLOCK - 8, b * BLOCK + 8:(b + 1) * BLOCK - 8]
+        if block.mean() > 127:
+            i |= 1 << b
+    return i
+
+
+# --------------------------------------------------
+# Stand-ins for the audio / model stages
+# --------------------------------------------------
+class FakeAudioMarker:
+    def get_analysis_window(self, video_path, start_ref=None, end_ref=None):
+        return WINDOW
+
+    def analyze_activity(self, start_sec, end_sec):
+        return {"spikes": list(SPIKES)}
+
+
+class PassingPrechecks:
+    def __init__(self, checks):
+        pass
+
+    def run_all(self, video_path, window=None):
+        return {"passed": True, "errors": []}
+
+
+class ScriptedDetector:
+    """
+    One seated person; keypoints follow keypoints_at(window time)
+    """
+
+    def __init__(self):
+        self.times = []
+
+    def detect(self, frame):
+        t = frame_index(frame) / FPS - WINDOW[0]
+        self.times.append(t)
+        return [PoseDetection([60, 100, 260, 470], keypoints_at(t), 0.9)]
+
+
+class NoFace:
+    def process(self, rgb):
+        return SimpleNamespace(multi_face_landmarks=None)
+
+
+class Killed(Exception):
+    pass
+
+
+def run(video_path, kill_at_sec=None):
+    managers = []
+    detector = ScriptedDetector()
+
+    class RecordingManager(MovementManager):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            managers.append(self)
+
+    def on_progress(processed_sec, window_sec):
+        if kill_at_sec is not None and processed_sec >= kill_at_sec:
+            raise Killed()
+
+    patches = {
+        "AudioMarker": FakeAudioMarker,
+        "PrecheckManager": PassingPrechecks,
+        "get_pose_detector": lambda **kwargs: detector,
+        "get_face_mesh": lambda reset=False: NoFace(),
+        "MovementManager": RecordingManager,
+        "Checkpointer": lambda session_dir: Checkpointer(session_dir, interval_sec=0),
+        "generate_participant_pdf": lambda output_dir, participant_id, **kw:
+            os.path.join(output_dir, f"{participant_id}.pdf")
+    }
+    saved = {name: getattr(av_module, name) for name in patches}
+    for name, value in patches.items():
+        setattr(av_module, name, value)
+
+    try:
+        result = analyze_video(video_path, "session-1", ["p1"], progress_callback=on_progress)
+    except Killed:
+        result = None
+    finally:
+        for name, value in saved.items():
+            setattr(av_module, name, value)
+
+    return result, managers[0], detector.times
+
+
+def run_test():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["PDF_REPORT_DIR"] = os.path.join(tmp, "pdf")
+
+        reference_path = os.path.join(tmp, "reference", "video.avi")
+        session_path = os.path.join(tmp, "session", "video.avi")
+        for path in (reference_path, session_path):
+            os.makedirs(os.path.dirname(path))
+            write_video(path)
+
+        # Uninterrupted run
+        expected, _, _ = run(reference_path)
+        assert expected["status"] == "SUCCESS", expected
+
+        # Killed at 60 s of the window — mid leg movement (60-70 s)
+        result, _, _ = run(session_path, kill_at_sec=60)
+        assert result is None
+        assert Checkpointer(os.path.dirname(session_path)).load(session_path)
+
+        # Next run resumes near 60 s (last checkpoint, not 0), hints restored
+        result, manager, times = run(session_path)
+        assert 45 <= times[0] <= 60, times[:5]
+        assert manager.audio_hints == SPIKES, manager.audio_hints
+        assert manager.audio_hint_radius == 2.0
+
+        assert result["status"] == "SUCCESS", result
+        assert result["participants"] == expected["participants"], \
+            (result["participants"], expected["participants"])
+        assert not Checkpointer(os.path.dirname(session_path)).load(session_path)
+
+    print("✅ Killed analyze_video run resumes from its checkpoint with the same report")
+
+
+if __name__ == "__main__":
+    run_test()
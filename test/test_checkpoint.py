@@ -0,0 +1,91 @@
+import sys
+import os
+import tempfile
+
+# --------------------------------------------------
+# Add project root
+# --------------------------------------------------
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from movement.arm import ArmMovement
+from movement.leg import LegMovement
+from tracking.iou_tracker import IOUTracker
+from runtime_checks.participant_discontinuity import ParticipantDiscontinuity
+from pipeline.checkpoint import Checkpointer, config_fingerprint
+from test_time_based_hold import keypoints_at
+
+
+def make_components():
+    return {
+        "arm": ArmMovement(wrist_thresh=15, elbow_thresh=20, hold_seconds=0.8,
+                           fps=1, lap_margin=20, motion_interval=1.0),
+        "leg": LegMovement(ankle_thresh=10, knee_dist_thresh=20, hold_seconds=5,
+                           fps=1, stable_frames=10, motion_interval=1.0),
+        "tracker": IOUTracker(iou_thresh=0.3),
+        "participants": ParticipantDiscontinuity(max_absent_seconds=15, fps=1)
+    }
+
+
+def step(components, t, events):
+    kp = keypoints_at(t)
+    for name in ("arm", "leg"):
+        signal = components[name].update("person_1", kp, timestamp=t)
+        if signal:
+            events.append((name, signal, t))
+
+    tracked = components["tracker"].update([[100 + t, 50, 200 + t, 400]])
+    for tid, _ in tracked:
+        # Person leaves between 30 s and 50 s
+        if not 30 <= t < 50:
+            components["participants"].update(f"person_{tid}", t)
+    components["participants"].check(t)
+
+
+def run_test():
+    times = [i * 0.5 for i in range(200)]
+
+    # Uninterrupted run
+    reference = make_components()
+    expected = []
+    for t in times:
+        step(reference, t, expected)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "video.mp4")
+        open(video, "wb").close()
+
+        # Killed at 62 s — mid leg hold, after an absence
+        first = make_components()
+        events = []
+        for t in times[:124]:
+            step(first, t, events)
+
+        config = config_fingerprint(make_components())
+        Checkpointer(tmp).save(video, (10.0, 110.0), {"frame_idx": 124}, first, config=config)
+
+        # Fresh process: new objects, restored from disk
+        data = Checkpointer(tmp).load(video)
+        assert data["window"] == (10.0, 110.0)
+
+        # Other thresholds → checkpoint not restored
+        changed = make_components()
+        changed["leg"].ankle_thresh = 12
+        assert config_fingerprint(changed) != config
+        assert not Checkpointer.restore(changed, data, config_fingerprint(changed))
+        assert changed["tracker"].next_id == make_components()["tracker"].next_id
+
+        resumed = make_components()
+        assert config_fingerprint(resumed) == config
+        assert Checkpointer.restore(resumed, data, config_fingerprint(resumed))
+        for t in times[data["position"]["frame_idx"]:]:
+            step(resumed, t, events)
+
+    assert events == expected, (events, expected)
+    assert resumed["tracker"].next_id == reference["tracker"].next_id
+    assert dict(resumed["participants"].discontinuities) == \
+        dict(reference["participants"].discontinuities)
+
+    print(f"✅ Resumed run matches uninterrupted run ({len(events)} events)")
+
+
+if __name__ == "__main__":
+    run_test()
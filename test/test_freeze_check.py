@@ -0,0 +1,74 @@
+import sys
+import os
+import tempfile
+import cv2
+import numpy as np
+
+# --------------------------------------------------
+# Add project root
+# --------------------------------------------------
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from prechecks.freeze_detection import FreezeCheck
+
+FPS = 1
+DURATION_SEC = 600
+PROBES = 12
+SPACING = DURATION_SEC / PROBES
+
+
+def room():
+    # Smooth synthetic room: coarse random layout, upscaled
+    coarse = (np.random.default_rng(7).random((6, 8, 3)) * 200 + 25).astype(np.uint8)
+    return cv2.resize(coarse, (640, 360), interpolation=cv2.INTER_CUBIC)
+
+
+def write_video(path, make_frame):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), FPS, (640, 360))
+    for i in range(DURATION_SEC * FPS):
+        writer.write(make_frame(i / FPS))
+    writer.release()
+
+
+def live_still(t, base=room(), rng=np.random.default_rng(1)):
+    # Nobody moves, but the sensor adds (luma) noise to every frame
+    noise = rng.normal(0, 3, base.shape[:2] + (1,))
+    return np.clip(base + noise, 0, 255).astype(np.uint8)
+
+
+def frozen(t, base=room()):
+    return base.copy()
+
+
+def frozen_at_probes(t, base=room()):
+    # Same picture around every probe, someone moving in between
+    offset = (t - 0.5 * SPACING) % SPACING
+    frame = base.copy()
+    if 10 <= offset <= 40:
+        x = int(offset * 10)
+        frame[120:240, x:x + 80] = 255
+    return frame
+
+
+def run_test():
+    check = FreezeCheck(probes=PROBES, burst_frames=5, max_frozen_seconds=120, confirm_step_sec=20)
+
+    cases = [
+        ("live still room", live_still, True),
+        ("frozen picture", frozen, False),
+        ("same picture at probes only", frozen_at_probes, True)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make_frame, expected in cases:
+            path = os.path.join(tmp, f"{make_frame.__name__}.avi")
+            write_video(path, make_frame)
+
+            result = check.run(path)
+            print(f"{name:<28} | passed={result.ok} | {result.error_code} {result.message or ''}")
+            assert result.ok == expected, name
+
+    print("\n Test PASSED — only a confirmed, continuous freeze fails the precheck")
+
+
+if __name__ == "__main__":
+    run_test()
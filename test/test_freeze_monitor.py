@@ -0,0 +1,72 @@
+import sys
+import os
+import cv2
+import numpy as np
+
+# --------------------------------------------------
+# Add project root
+# --------------------------------------------------
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from runtime_checks.freeze_monitor import RuntimeFreezeMonitor
+
+
+def scene(seed, noise=0.0):
+    # Smooth synthetic room: coarse random layout, upscaled
+    rng = np.random.default_rng(seed)
+    coarse = (rng.random((6, 8, 3)) * 255).astype(np.uint8)
+    frame = cv2.resize(coarse, (640, 360), interpolation=cv2.INTER_CUBIC)
+    if noise:
+        # Live camera: fresh (luma) sensor noise on every frame
+        jitter = np.random.default_rng().normal(0, noise, frame.shape[:2] + (1,))
+        frame = np.clip(frame + jitter, 0, 255).astype(np.uint8)
+    return frame
+
+
+def recompressed(frame, i):
+    # Frozen picture re-encoded frame after frame: compression noise only
+    quality = 80 + i % 10
+    _, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return cv2.imdecode(buf, cv2.IMREAD_COLOR)
+
+
+def run_at(sample_fps, frozen_from=30, duration=120, still=False):
+    monitor = RuntimeFreezeMonitor(freeze_seconds=60, max_hamming=10)
+
+    for i in range(int(duration * sample_fps)):
+        t = i / sample_fps
+        # Changing picture, then the same picture with compression noise
+        # (frozen) or with sensor noise (live camera, nobody moving)
+        if t < frozen_from:
+            frame = scene(i)
+        elif still:
+            frame = scene(999, noise=3.0)
+        else:
+            frame = recompressed(scene(999), i)
+        error = monitor.update(frame, timestamp=t)
+        if error:
+            return t, error
+
+    return None, None
+
+
+def run_test():
+    print("## Runtime freeze monitor (dHash + Hamming, seconds)\n")
+
+    for fps in (0.5, 1, 5):
+        t, error = run_at(fps)
+        print(f"{fps:>4} FPS | freeze reported at {t}s | {error}")
+
+        assert error is not None and error["code"] == "VIDEO_DISCONTINUITY"
+        assert 90 <= t <= 92, "freeze must be reported 60 s after it began"
+
+    t, error = run_at(1, frozen_from=10_000)
+    assert error is None, "changing video must not be reported as frozen"
+
+    t, error = run_at(1, still=True)
+    assert error is None, "live still room must not be reported as frozen"
+
+    print("\n Test PASSED — near-frozen frames detected at any sampling rate")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,90 @@
+import sys
+import os
+import time
+import json
+import tempfile
+import threading
+
+# --------------------------------------------------
+# Add project root
+# --------------------------------------------------
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from pipeline.job_lease import JobLease
+
+
+def expire(lease, job_id):
+    with open(lease._path(job_id)) as f:
+        data = json.load(f)
+    data["expires"] = time.time() - 1
+    with open(lease._path(job_id), "w") as f:
+        json.dump(data, f)
+
+
+def run_test():
+    with tempfile.TemporaryDirectory() as tmp:
+        a = JobLease(tmp, ttl_sec=60, owner="a")
+        b = JobLease(tmp, ttl_sec=60, owner="b")
+
+        # One owner per job
+        assert a.acquire("job1")
+        assert not b.acquire("job1")
+
+        # Renew only touches own leases
+        b.renew("job1")
+        assert a._read("job1")["owner"] == "a"
+
+        # Dead worker → lease expires → taken over
+        expire(a, "job1")
+        assert b.acquire("job1")
+        assert b._read("job1")["owner"] == "b"
+        assert not a.acquire("job1")
+
+        # Many workers racing for the same stale lease → exactly one wins
+        expire(b, "job1")
+        workers = [JobLease(tmp, ttl_sec=60, owner=f"w{i}") for i in range(16)]
+        barrier = threading.Barrier(len(workers))
+        won = []
+
+        def race(lease):
+            barrier.wait()
+            if lease.acquire("job1"):
+                won.append(lease.owner)
+
+        threads = [threading.Thread(target=race, args=(w,)) for w in workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(won) == 1, won
+        assert a._read("job1")["owner"] == won[0]
+
+        # Abandoned takeover lock does not block forever
+        expire(a, "job1")
+        open(a._path("job1") + ".lock", "w").close()
+        assert not a.acquire("job1")
+        a.lock_timeout_sec = 0
+        time.sleep(0.01)
+        assert a.acquire("job1")
+
+        # Done marker blocks re-runs until the API stops listing the job
+        a.release("job1", done=True)
+        assert not b.acquire("job1")
+        a.prune_done(["job1"])
+        assert not b.acquire("job1")
+        a.prune_done([])
+        assert b.acquire("job1")
+
+        # Failed job released for retry; running leases survive pruning
+        b.release("job1", done=False)
+        assert a.acquire("job1")
+        b.prune_done([])
+        assert a._read("job1")["state"] == "running"
+
+        assert not [n for n in os.listdir(tmp) if n.endswith((".tmp", ".lock"))]
+
+    print("✅ Job leases: exclusive, atomic stale takeover, done markers pruned")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -13,6 +13,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from yolo.inference import YOLOPoseDetector
 from movement.leg import LegMovement
 from tracking.iou_tracker import IOUTracker
+from ingestion.frame_store import open_frame_store
 
 # --------------------------------------------------
 # CONFIG
@@ -21,6 +22,9 @@ VIDEO_PATH = r"D:\Pankaj\Meditation proctor Main\videos\eef35db0\video.mp4"
 DISPLAY_SCALE = 0.8
 FPS_PROCESS = 1          # 1 FPS for long video
 PRINT_INTERVAL_SEC = 30  # Console logging interval
+# Decoded once into <video>.frames_1fps_<width>/, memory-mapped afterwards.
+# Leg thresholds are in source pixels → keypoints are scaled back
+FRAME_STORE_WIDTH = 640
 
 # --------------------------------------------------
 # INITIALIZE
@@ -46,10 +50,8 @@ leg_movement = LegMovement(
     stable_frames=10
 )
 
-cap = cv2.VideoCapture(VIDEO_PATH)
-video_fps = cap.get(cv2.CAP_PROP_FPS)
-FRAME_STRIDE = int(video_fps / FPS_PROCESS)
-frame_idx = 0
+store = open_frame_store(VIDEO_PATH, fps=FPS_PROCESS, width=FRAME_STORE_WIDTH)
+scale = store.scale     # stored px → source px
 
 # Count storage for display
 leg_counts = defaultdict(int)
@@ -63,18 +65,11 @@ print(f"▶ Processing at {FPS_PROCESS} FPS\n")
 # --------------------------------------------------
 # MAIN LOOP
 # --------------------------------------------------
-while cap.isOpened():
+for timestamp_sec, frame in store.iter_frames():
 
-    ret, frame = cap.read()
-    if not ret:
-        break
-
-    frame_idx += 1
-
-    if frame_idx % FRAME_STRIDE != 0:
-        continue
+    # Stored frames are read-only views; copy before drawing
+    frame = frame.copy()
 
-    timestamp_sec = frame_idx / video_fps
     timestamp_txt = time.strftime("%H:%M:%S", time.gmtime(timestamp_sec))
 
     detections = detector.detect(frame)
@@ -84,7 +79,7 @@ while cap.isOpened():
 
     for det in detections:
         x1, y1, x2, y2 = det.bbox
-        area = (x2 - x1) * (y2 - y1)
+        area = (x2 - x1) * (y2 - y1) * scale ** 2
 
         if area < 6000:
             continue
@@ -110,7 +105,7 @@ while cap.isOpened():
         if keypoints is None:
             continue
 
-        signal = leg_movement.update(person_id, keypoints)
+        signal = leg_movement.update(person_id, keypoints * scale)
 
         if signal == "START":
             leg_counts[person_id] += 1
@@ -203,7 +198,6 @@ while cap.isOpened():
 # --------------------------------------------------
 # FINAL SUMMARY
 # --------------------------------------------------
-cap.release()
 cv2.destroyAllWindows()
 
 print("\n▶ FINAL LEG MOVEMENT COUNTS")
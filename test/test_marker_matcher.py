@@ -0,0 +1,56 @@
+import sys
+import os
+import numpy as np
+from scipy.signal import correlate
+
+# --------------------------------------------------
+# Add project root
+# --------------------------------------------------
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from audio.marker_matcher import MultiMarkerMatcher
+
+
+def reference_timestamp(signal, ref, sr, threshold=0.85):
+    # Same decision as AudioMarker.detect_audio_timestamp
+    correlation = correlate(signal, ref, mode="valid")
+    correlation /= np.max(correlation)
+    peaks = np.where(correlation > threshold)[0]
+    return None if len(peaks) == 0 else peaks[0] / sr
+
+
+def run_test():
+    SR = 16000
+    rng = np.random.default_rng(0)
+
+    start_ref = rng.standard_normal(SR // 2)       # 0.5 s chirp stand-in
+    bell_ref = rng.standard_normal(SR // 4)
+    end_ref = rng.standard_normal(SR)
+
+    signal = 0.05 * rng.standard_normal(SR * 90)    # 90 s of room noise
+    placements = {"start": (3.25, start_ref), "bell": (41.0, bell_ref), "end": (80.5, end_ref)}
+
+    for _, (sec, ref) in placements.items():
+        i = int(sec * SR)
+        signal[i:i + len(ref)] += ref
+
+    matcher = MultiMarkerMatcher(
+        {name: ref for name, (_, ref) in placements.items()}
+    )
+    found = matcher.match(signal, SR)
+
+    print("## Multi-marker matcher\n")
+    for name, (sec, ref) in placements.items():
+        expected = reference_timestamp(signal, ref, SR)
+        print(f"{name:6s} | placed {sec:7.3f}s | found {found[name]:7.3f}s | scipy {expected:7.3f}s")
+
+        assert abs(found[name] - expected) <= 1.0 / SR, f"{name} differs from single-template correlation"
+        assert abs(found[name] - sec) < 1.0 / SR
+
+    missing = MultiMarkerMatcher({"absent": np.zeros(100)}).match(signal, SR)
+    assert missing["absent"] is None
+
+    print("\n Test PASSED — all markers found in one pass")
+
+
+if __name__ == "__main__":
+    run_test()
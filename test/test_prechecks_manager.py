@@ -29,7 +29,8 @@ precheck_manager = PrecheckManager([
     VideoMetadataCheck(min_duration_sec=2.75 * 3600),   # 2h 45m
     IlluminationCheck(min_brightness=40),
     FreezeCheck(
-        sample_frames=60,
+        probes=12,
+        burst_frames=5,
         diff_thresh=1.0,
         identical_ratio_thresh=1.0
     ),
@@ -0,0 +1,124 @@
+import sys
+import os
+import json
+import time
+import socket
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --------------------------------------------------
+# Add project root
+# --------------------------------------------------
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from pipeline.report_uploader import ReportUploader, UploadError
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    /proctoringTool/uploadReport: first attempt per participant → 503
+    /yog/proctoringResult: records the body (answers late for session "slow")
+    """
+    attempts = {}
+    results = []
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        assert self.headers["Authorization"] == "Bearer token"
+
+        if self.path == "/proctoringTool/uploadReport":
+            p_id = body.split(b'name="participantId"\r\n\r\n')[1].split(b"\r\n")[0].decode()
+            assert b"%PDF-stub" in body, "file must be re-sent on retry"
+
+            with self.lock:
+                self.attempts[p_id] = self.attempts.get(p_id, 0) + 1
+                first = self.attempts[p_id] == 1
+
+            if first:
+                self._reply(503, {"error": "busy"})
+            else:
+                self._reply(201, {"reportLink": f"https://reports/{p_id}.pdf"})
+
+        elif self.path == "/yog/proctoringResult":
+            result = json.loads(body)
+            self.results.append(result)
+            if result["sessionId"] == "slow":
+                time.sleep(0.5)
+            self._reply(200, {"ok": True})
+
+        else:
+            self._reply(404, {})
+
+
+def run_test():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_reports = {}
+        for p_id in ["p1", "p2", "p3"]:
+            path = os.path.join(tmp, f"{p_id}.pdf")
+            with open(path, "wb") as f:
+                f.write(b"%PDF-stub " + p_id.encode())
+            pdf_reports[p_id] = path
+        pdf_reports["missing"] = os.path.join(tmp, "missing.pdf")
+
+        uploader = ReportUploader(base_url, "token", max_parallel=3, backoff_sec=0.01)
+        links, errors = uploader.upload_reports(pdf_reports)
+
+        assert links == {p: f"https://reports/{p}.pdf" for p in ["p1", "p2", "p3"]}, links
+        assert list(errors) == ["missing"], errors
+        assert all(n == 2 for n in StubHandler.attempts.values()), StubHandler.attempts
+
+        payload = [
+            {"participantId": p, "reportLink": link, "status": "PASS"}
+            for p, link in links.items()
+        ]
+        uploader.submit_results("session-1", payload)
+        uploader.close()
+
+        # Read timeout: the server may have stored the POST → no retry
+        slow = ReportUploader(base_url, "token", timeout=0.2, backoff_sec=0.01)
+        try:
+            slow.submit_results("slow", payload)
+            raise AssertionError("read timeout must fail")
+        except UploadError:
+            pass
+        slow.close()
+
+    # Nothing listening: the request never left → retried
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        closed_url = f"http://127.0.0.1:{s.getsockname()[1]}"
+    refused = ReportUploader(closed_url, "token", retries=2, backoff_sec=0.01)
+    try:
+        refused.submit_results("session-2", payload)
+        raise AssertionError("refused connection must fail")
+    except UploadError as e:
+        assert "after 3 attempts" in str(e), e
+    refused.close()
+
+    server.shutdown()
+
+    assert StubHandler.results == [
+        {"sessionId": "session-1", "results": payload},
+        {"sessionId": "slow", "results": payload}
+    ], StubHandler.results
+    print("✅ Reports uploaded in parallel with retry; results submitted once")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,80 @@
+import sys
+import os
+import numpy as np
+
+# --------------------------------------------------
+# Add project root
+# --------------------------------------------------
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from movement.arm import ArmMovement
+from movement.leg import LegMovement
+
+
+def keypoints_at(t):
+    """
+    Seated person; right wrist rises from t=20s to t=24s (40 px/s),
+    both ankles slide from t=60s to t=70s (15 px/s)
+    """
+    kp = np.full((17, 2), 100.0)
+    kp[11] = [90, 300]       # L hip
+    kp[12] = [130, 300]      # R hip
+    kp[7] = [80, 220]        # L elbow
+    kp[8] = [140, 220]       # R elbow
+    kp[9] = [85, 310]        # L wrist (on lap)
+    kp[10] = [135, 310]      # R wrist (on lap)
+    kp[13] = [90, 380]       # knees
+    kp[14] = [130, 380]
+    kp[15] = [90, 450]       # ankles
+    kp[16] = [130, 450]
+
+    kp[10][1] -= 40 * np.clip(t - 20, 0, 4)
+    kp[15][0] += 15 * np.clip(t - 60, 0, 10)
+    kp[16][0] += 15 * np.clip(t - 60, 0, 10)
+    return kp
+
+
+def run_at(sample_fps, duration=100):
+    arm = ArmMovement(wrist_thresh=15, elbow_thresh=20, hold_seconds=0.8,
+                      fps=1, lap_margin=20, motion_interval=1.0)
+    leg = LegMovement(ankle_thresh=10, knee_dist_thresh=20, hold_seconds=5,
+                      fps=1, stable_frames=10, motion_interval=1.0)
+
+    events = {"arm": [], "leg": []}
+    for i in range(int(duration * sample_fps) + 1):
+        t = i / sample_fps
+        kp = keypoints_at(t)
+
+        for name, det in (("arm", arm), ("leg", leg)):
+            signal = det.update("person_1", kp, timestamp=t)
+            if signal:
+                events[name].append((signal, t))
+
+    return events
+
+
+def run_test():
+    print("## Time-based hold/still thresholds\n")
+
+    results = {fps: run_at(fps) for fps in (0.5, 1, 5)}
+
+    for fps, events in results.items():
+        print(f"{fps:>4} FPS | {events}")
+
+    base = results[1]
+    for fps, events in results.items():
+        for part in ("arm", "leg"):
+            assert [s for s, _ in events[part]] == [s for s, _ in base[part]], \
+                f"{part} events differ at {fps} FPS"
+
+            for (_, t), (_, t_base) in zip(events[part], base[part]):
+                assert abs(t - t_base) <= 2.0, \
+                    f"{part} event time drifts at {fps} FPS ({t} vs {t_base})"
+
+    assert [s for s, _ in base["arm"]] == ["START", "END"]
+    assert [s for s, _ in base["leg"]] == ["START", "END"]
+
+    print("\n Test PASSED — same events at 0.5, 1 and 5 FPS")
+
+
+if __name__ == "__main__":
+    run_test()
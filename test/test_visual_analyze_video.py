@@ -13,13 +13,16 @@ from tracking.iou_tracker import IOUTracker
 from identity.role_assigner import RoleAssigner
 from movement.movement_manager import MovementManager
 from audio.audio_marker import AudioMarker
+from ingestion.frame_store import open_frame_store
 
 # --------------------------------------------------
 # CONFIG
 # --------------------------------------------------
 VIDEO_PATH = r"D:\Meditation proctor\data\bfcca4dc\video.mp4.mkv"
 DISPLAY_SCALE = 0.9
-FPS_OVERRIDE = None   # set to 25 if OpenCV fps is wrong
+# Frames are decoded once into <video>.frames_1fps_<width>/ and memory-mapped
+# on later runs. Thresholds are in source pixels → keypoints are scaled back
+FRAME_STORE_WIDTH = 640
 FONT = cv2.FONT_HERSHEY_SIMPLEX
 
 # --------------------------------------------------
@@ -35,9 +38,6 @@ tracker = IOUTracker(iou_thresh=0.3)
 role_assigner = RoleAssigner()
 movement_manager = MovementManager(fps=25)
 
-cap = cv2.VideoCapture(VIDEO_PATH)
-fps = FPS_OVERRIDE or cap.get(cv2.CAP_PROP_FPS)
-
 audio_marker = AudioMarker()
 start_sec, end_sec = audio_marker.get_analysis_window(
     VIDEO_PATH,
@@ -45,12 +45,16 @@ start_sec, end_sec = audio_marker.get_analysis_window(
     end_ref=r"D:\Meditation proctor\reference_audio\end_audio.wav"
 )
 
-start_frame = int(start_sec * fps)
-end_frame = int(end_sec * fps)
-
-frame_idx = 0
-FRAME_STRIDE = int(fps)  # 1 FPS processing
+# 1 FPS processing
+store = open_frame_store(
+    VIDEO_PATH,
+    fps=1,
+    width=FRAME_STORE_WIDTH,
+    start_sec=start_sec,
+    end_sec=end_sec
+)
 
+scale = store.scale     # stored px → source px
 participant_last_seen = {}
 
 print("\nVISUAL ANALYSIS STARTED")
@@ -60,26 +64,12 @@ print("Press Q to quit\n")
 # --------------------------------------------------
 # LOOP
 # --------------------------------------------------
-while cap.isOpened():
-
-    ret, frame = cap.read()
-    if not ret:
-        break
-
-    frame_idx += 1
-
-    # Skip before window
-    if frame_idx < start_frame:
-        continue
-
-    if frame_idx > end_frame:
-        break
+for video_sec, frame in store.iter_frames(start_sec, end_sec):
 
-    # 1 FPS processing
-    if frame_idx % FRAME_STRIDE != 0:
-        continue
+    # Stored frames are read-only views; copy before drawing
+    frame = frame.copy()
 
-    timestamp_sec = (frame_idx - start_frame) / fps
+    timestamp_sec = video_sec - start_sec
 
     detections = detector.detect(frame)
 
@@ -88,12 +78,12 @@ while cap.isOpened():
 
     for det in detections:
         x1, y1, x2, y2 = det.bbox
-        area = (x2 - x1) * (y2 - y1)
+        area = (x2 - x1) * (y2 - y1) * scale ** 2
         if area < 6000:
             continue
         bbox = [x1, y1, x2, y2]
         bboxes.append(bbox)
-        pose_map[tuple(bbox)] = det.keypoints
+        pose_map[tuple(bbox)] = det.keypoints * scale
 
     bboxes = sorted(
         bboxes,
@@ -135,7 +125,7 @@ while cap.isOpened():
             frame_sec=timestamp_sec
         )
 
-        participant_last_seen[person_id] = frame_idx
+        participant_last_seen[person_id] = timestamp_sec
 
         # DRAW PERSON
         cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
@@ -157,7 +147,7 @@ while cap.isOpened():
     # DISCONTINUITY VISUAL
     for pid, role in role_assigner.role_map.items():
         last_seen = participant_last_seen.get(pid)
-        if last_seen and frame_idx - last_seen > int(15 * fps):
+        if last_seen and timestamp_sec - last_seen > 15:
             cv2.putText(
                 frame,
                 f"{pid} ({role}) DISCONTINUED",
@@ -174,7 +164,6 @@ while cap.isOpened():
     if cv2.waitKey(1) & 0xFF == ord("q"):
         break
 
-cap.release()
 cv2.destroyAllWindows()
 
 print("\nVISUAL ANALYSIS FINISHED")
@@ -0,0 +1,25 @@
+import cv2
+
+
+def gray_thumbnail(frame, size=(64, 36)):
+    """
+    Small grayscale copy of a BGR frame. Resizes BEFORE the colour
+    conversion so cvtColor never runs at full resolution.
+    """
+    small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+
+def gray_sample(frame, width=160):
+    """
+    Grayscale nearest-neighbour pixel sample of a BGR frame (aspect kept).
+    Unlike gray_thumbnail nothing is averaged, so per-pixel sensor noise
+    survives: a live camera on a still room never matches itself, a
+    repeated (frozen) picture does.
+    """
+    h, w = frame.shape[:2]
+    size = (width, max(1, int(h * width / w)))
+    small = cv2.resize(frame, size, interpolation=cv2.INTER_NEAREST)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return small
@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from ultralytics import YOLO
 
 
@@ -14,9 +15,12 @@ class YOLOPoseDetector:
         weights="yolov11l-pose.pt",
         conf=0.4,
         iou=0.5,
-        imgsz=640        # 🔑 BEST SIZE FOR POSE
+        imgsz=640,       # 🔑 BEST SIZE FOR POSE
+        model=None,      # already loaded YOLO (see yolo.model_registry)
+        lock=None        # shared model → serialise inference
     ):
-        self.model = YOLO(weights)
+        self.model = model if model is not None else YOLO(weights)
+        self.lock = lock if lock is not None else nullcontext()
         self.conf = conf
         self.iou = iou
         self.imgsz = imgsz
@@ -27,13 +31,14 @@ class YOLOPoseDetector:
         DO NOT resize frame before calling this.
         """
 
-        results = self.model(
-            frame,
-            imgsz=self.imgsz,   # ✅ controlled resize
-            conf=self.conf,
-            iou=self.iou,
-            verbose=False
-        )[0]
+        with self.lock:
+            results = self.model(
+                frame,
+                imgsz=self.imgsz,   # ✅ controlled resize
+                conf=self.conf,
+                iou=self.iou,
+                verbose=False
+            )[0]
 
         detections = []
 
@@ -0,0 +1,94 @@
+"""
+Process-wide model registry.
+
+- YOLO weights are loaded ONCE per process, warmed up with a dummy
+  inference and shared by every session; a per-model lock serialises
+  inference when sessions run in threads.
+- MediaPipe FaceMesh keeps tracking state, so there is one per thread
+  (= one per concurrently running session), reset between sessions
+  instead of being rebuilt.
+"""
+
+import threading
+import numpy as np
+from ultralytics import YOLO
+from yolo.inference import YOLOPoseDetector
+
+POSE_WEIGHTS = "yolov8n-pose.pt"
+
+_lock = threading.Lock()
+_models = {}        # weights -> (YOLO, inference lock)
+_warm = set()       # (weights, imgsz)
+_local = threading.local()
+
+
+def _warm_up(model, imgsz):
+    dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+    model(dummy, imgsz=imgsz, verbose=False)
+
+
+def get_model(weights, imgsz=640, warmup=True):
+    """
+    Returns (model, lock) — one YOLO instance per weights file per process
+    """
+    with _lock:
+        if weights not in _models:
+            _models[weights] = (YOLO(weights), threading.Lock())
+
+        model, model_lock = _models[weights]
+
+        if warmup and (weights, imgsz) not in _warm:
+            with model_lock:
+                _warm_up(model, imgsz)
+            _warm.add((weights, imgsz))
+
+        return model, model_lock
+
+
+def get_pose_detector(weights=POSE_WEIGHTS, conf=0.6, iou=0.5, imgsz=640):
+    """
+    Pose detector sharing the registry's model; thresholds are per caller
+    """
+    model, model_lock = get_model(weights, imgsz=imgsz)
+    return YOLOPoseDetector(
+        weights=weights,
+        conf=conf,
+        iou=iou,
+        imgsz=imgsz,
+        model=model,
+        lock=model_lock
+    )
+
+
+def get_face_mesh(reset=False):
+    """
+    This thread's FaceMesh. reset=True clears its tracking context (start
+    of a new session) without reloading the graph.
+    """
+    mesh = getattr(_local, "face_mesh", None)
+
+    if mesh is None:
+        import mediapipe as mp
+
+        mesh = mp.solutions.face_mesh.FaceMesh(
+            static_image_mode=False,
+            max_num_faces=1,
+            refine_landmarks=True,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        )
+        mesh.process(np.zeros((64, 64, 3), dtype=np.uint8))    # warm-up
+        _local.face_mesh = mesh
+
+    elif reset and hasattr(mesh, "reset"):
+        mesh.reset()
+
+    return mesh
+
+
+def warm_up(weights=POSE_WEIGHTS, imgsz=640):
+    """
+    Preload everything a session needs (call once at worker start)
+    """
+    get_model(weights, imgsz=imgsz)
+    get_face_mesh()